@@ -0,0 +1,68 @@
+"""세 Streamlit 앱이 함께 쓰는 캐시 (위젯을 누를 때마다 다시 실행되는 스크립트를 가볍게 유지)
+
+업로드 파일은 내용의 해시로 st.cache_data에 넣어 두므로 시트/열을 고르거나 슬라이더를
+움직여도 같은 파일을 다시 읽지 않는다. 예상 비용도 잠시 캐시하고, 번역이 끝나면 비운다.
+재실행 시간 예산은 perf_budget.py로 검사한다.
+"""
+import hashlib
+import io
+import time
+from collections import namedtuple
+
+import streamlit as st
+
+from translation_cache import normalize_word
+from usage_metrics import estimate_cost
+from word_core import read_word_table
+from word_reader import list_columns, list_sheets
+
+# 예상 비용을 다시 계산하기까지의 시간 (초)
+ESTIMATE_TTL_SECONDS = 60
+# 함수마다 보관할 업로드 파일 수
+MAX_CACHED_UPLOADS = 16
+
+# 업로드 파일 내용과 해시 (cache_data는 해시와 이름으로만 구분하고 내용은 다시 해시하지 않음)
+Upload = namedtuple("Upload", ["digest", "name", "data"])
+
+
+def read_upload(uploaded_file):
+    data = uploaded_file.getvalue()
+    return Upload(hashlib.sha256(data).hexdigest(), uploaded_file.name, data)
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_UPLOADS)
+def _sheets(digest, name, _data):
+    return list_sheets(io.BytesIO(_data), name)
+
+
+@st.cache_data(show_spinner=False, max_entries=MAX_CACHED_UPLOADS)
+def _columns(digest, name, sheet, _data):
+    return list_columns(io.BytesIO(_data), name, sheet)
+
+
+@st.cache_data(show_spinner="단어 파일을 읽는 중입니다...", max_entries=MAX_CACHED_UPLOADS)
+def _words(digest, name, sheet, column, _data):
+    start = time.perf_counter()
+    df = read_word_table(io.BytesIO(_data), name=name, sheet=sheet, column=column)
+    read_seconds = time.perf_counter() - start
+    # 대소문자, 공백만 다른 중복 단어는 한 번만 요청
+    return df, len(set(map(normalize_word, df["Word"]))), read_seconds
+
+
+def upload_sheets(upload):
+    return _sheets(upload.digest, upload.name, upload.data)
+
+
+def upload_columns(upload, sheet=None):
+    return _columns(upload.digest, upload.name, sheet, upload.data)
+
+
+def upload_words(upload, sheet=None, column=0):
+    """(단어 DataFrame, 중복을 뺀 단어 수, 파일을 처음 읽을 때 걸린 초)"""
+    return _words(upload.digest, upload.name, sheet, column, upload.data)
+
+
+# ✅ 예상 비용 (사용량 기록 조회와 환율을 위젯 조작마다 다시 하지 않음)
+@st.cache_data(ttl=ESTIMATE_TTL_SECONDS, show_spinner=False)
+def cached_estimate_cost(word_count, model, prompt_version, concurrency):
+    return estimate_cost(word_count, model, prompt_version, concurrency)
@@ -0,0 +1,210 @@
+"""세 Streamlit 앱이 함께 쓰는 화면 (업로드, 예상 비용, 작업 목록, 결과, 실행 보고서)
+
+앱은 비밀번호를 확인한 뒤 자기 번역 방식으로 render(variant)만 부른다.
+파워포인트 다운로드 버튼은 variant.has_pptx일 때만 보인다.
+"""
+import logging
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from app_cache import cached_estimate_cost, read_upload, upload_columns, upload_sheets, upload_words
+from batch_runner import DEFAULT_CONCURRENCY
+from job_queue import DONE, FAILED, FINISHED, STATUS_LABELS, get_default_queue, job_label
+from run_checkpoint import RunCheckpoint
+from run_report import RunReport
+from word_core import cached_export, pptx_file_extension, write_to_excel, write_to_pptx
+from word_reader import INPUT_TYPES
+
+# 작업 목록을 다시 그리는 간격 (초)
+JOB_POLL_SECONDS = 2
+
+# ✅ 실행 보고서 요약이 서버 로그에 남도록 설정 (Streamlit은 루트 로거를 설정하지 않음)
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+# httpx 등의 요청 로그는 빼고 실행 보고서만 INFO로 출력
+logging.getLogger("run_report").setLevel(logging.INFO)
+
+
+# ✅ 단어 파일 업로드, 예상 비용, 작업 추가
+def _show_upload(variant, queue, session_id):
+    uploaded_file = st.file_uploader("단어 파일을 업로드하세요 (엑셀, CSV, 텍스트)", type=INPUT_TYPES)
+    if uploaded_file is None:
+        return
+
+    # 시트가 여러 개거나 열이 여러 개면 단어를 읽을 곳을 직접 선택
+    # 업로드 파일은 내용 해시로 캐시하므로 위젯을 조작해도 다시 읽지 않음
+    upload = read_upload(uploaded_file)
+    sheets = upload_sheets(upload)
+    sheet = st.selectbox("시트 선택", sheets) if len(sheets) > 1 else None
+    column_names = upload_columns(upload, sheet)
+    column = st.selectbox("단어 열 선택", range(len(column_names)), format_func=column_names.__getitem__) if len(column_names) > 1 else 0
+    df, unique_count, read_seconds = upload_words(upload, sheet, column)
+    word_count = len(df)
+    concurrency = st.slider("동시 요청 수", min_value=1, max_value=10, value=DEFAULT_CONCURRENCY)
+
+    total_tokens, usd_cost, krw_cost, exchange_rate, estimated_time, samples = cached_estimate_cost(unique_count, variant.model, variant.prompt_version, concurrency)
+
+    st.write("업로드된 데이터:")
+    st.write(df)
+
+    st.subheader("예상 비용 및 시간")
+    st.write(f"- 단어 수: {word_count}개 (중복 제외 {unique_count}개)")
+    st.write(f"- 예상 토큰 수: {total_tokens}")
+    st.write(f"- 예상 비용 (USD): ${usd_cost:.4f}")
+    st.write(f"- 예상 비용 (KRW): {krw_cost:,.0f}원 (환율: {exchange_rate:.2f} KRW/USD)")
+    st.write(f"- 예상 시간: {estimated_time:.2f} 초")
+    if samples:
+        st.caption(f"최근 {samples}회 실제 요청 기록을 기준으로 추정했습니다.")
+    else:
+        st.caption("실제 요청 기록이 없어 기본값으로 추정했습니다.")
+
+    # ✅ 이전 실행이 중간에 끊겼으면 완료된 부분을 내려받거나 이어서 실행
+    checkpoint = RunCheckpoint.for_words(df["Word"].tolist(), variant.cache_namespace)
+    # 같은 단어 목록의 작업이 실행 중이면 체크포인트는 그 작업의 것이므로 이어서 실행하지 않음
+    active_job = queue.store.active(checkpoint.run_id)
+    saved_rows = checkpoint.load() if active_job is None else {}
+    if active_job is not None:
+        st.info(f"같은 단어 목록의 번역 작업이 이미 {STATUS_LABELS[active_job['status']]}입니다 "
+                f"({active_job['done']}/{active_job['total']}개 단어). 작업이 끝나면 다시 추가할 수 있습니다.")
+    elif saved_rows:
+        st.info(f"이전 실행에서 {len(saved_rows)}/{word_count}개 단어가 완료되었습니다. Go를 누르면 남은 단어부터 이어서 진행합니다.")
+        # 파일은 버튼을 누를 때 만듦 (data에 함수를 넘기면 Streamlit이 클릭 후 별도 스레드에서 실행)
+        partial_exports = st.session_state.setdefault("partial_exports", {})
+        partial_version = (checkpoint.path, len(saved_rows))
+        partial_rows = [row for position in sorted(saved_rows) for row in saved_rows[position]]
+        st.download_button(
+            label="완료된 부분 다운로드 (엑셀)",
+            data=lambda: cached_export(partial_exports, partial_version, "xlsx", write_to_excel, pd.DataFrame(partial_rows, columns=variant.columns)),
+            file_name="translated_vocabulary_partial.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key="download-partial"
+        )
+
+    if st.button("Go (번역 작업 추가)", disabled=active_job is not None):
+        # ✅ 번역은 백그라운드 작업자에서 실행 (페이지를 새로 고치거나 닫아도 계속 진행)
+        # 예상 값은 결과에서 실제 값과 비교하도록 작업에 함께 저장
+        estimate = {"seconds": estimated_time, "total_tokens": total_tokens, "usd_cost": usd_cost}
+        queue.submit(df["Word"].tolist(), variant.name, name=uploaded_file.name, session=session_id, concurrency=concurrency,
+                     estimate=estimate, read_seconds=read_seconds)
+        st.success("번역 작업을 추가했습니다. 아래 작업 목록에서 진행 상황을 볼 수 있습니다.")
+
+
+# ✅ 이 세션의 번역 작업 목록 (진행 중인 작업이 있으면 이 부분만 몇 초마다 다시 그림)
+def _show_jobs(variant, queue, session_id):
+    jobs = queue.store.list(session=session_id, variant=variant.name)
+    finished = [job["id"] for job in jobs if job["status"] in FINISHED]
+    if finished != st.session_state.finished_jobs:
+        # 작업이 끝나면 새 사용량을 예상 비용에 반영하고 결과를 그리도록 페이지 전체를 다시 실행
+        cached_estimate_cost.clear()
+        st.rerun()
+    for job in jobs:
+        label = job_label(job)
+        if job["status"] == FAILED:
+            st.error(f"{label}: 실패 ({job['error']})")
+        elif job["status"] == DONE:
+            st.write(f"{label}: 완료 ({job['total']}개 단어)")
+        else:
+            st.progress(job["done"] / job["total"] if job["total"] else 0.0,
+                        text=f"{label}: {STATUS_LABELS[job['status']]} ({job['done']}/{job['total']}개 단어)")
+            # 완료된 배치부터 표에 바로 표시 (체크포인트에 기록된 행)
+            partial_rows = queue.partial_rows(job["id"])
+            if partial_rows:
+                st.dataframe(pd.DataFrame(partial_rows, columns=variant.columns))
+
+
+# ✅ 끝난 작업의 결과, 실제 사용량(예상 값과 비교), 다운로드, 실행 보고서
+def _show_results(variant, queue, done_jobs):
+    st.subheader("번역 및 예문 생성 결과")
+    job_id = st.selectbox("결과를 볼 작업", list(done_jobs), format_func=lambda job_id: job_label(done_jobs[job_id]))
+    job = done_jobs[job_id]
+    summary = job["summary"]
+    run_stats = summary["stats"]
+    word_count = job["total"]
+
+    # 끝난 작업의 결과는 바뀌지 않으므로 세션에 한 번만 불러 둠
+    job_results = st.session_state.setdefault("job_results", {})
+    if job_id not in job_results:
+        job_results[job_id] = (pd.DataFrame(queue.store.rows(job_id), columns=variant.columns), RunReport.load(summary["report"]))
+    result_df, report = job_results[job_id]
+
+    estimate = summary["estimate"]
+    st.write(f"실제 소요 시간: {summary['seconds']:.2f} 초 (예상 {estimate['seconds']:.2f} 초)")
+    st.write(f"실제 토큰 수: {summary['prompt_tokens'] + summary['completion_tokens']:,} (예상 {estimate['total_tokens']:,.0f}, 입력 {summary['prompt_tokens']:,} / 출력 {summary['completion_tokens']:,})")
+    st.write(f"실제 비용 (USD): ${summary['usd_cost']:.4f} (예상 ${estimate['usd_cost']:.4f})")
+    hit_rate = run_stats["cache_hits"] / word_count if word_count else 0
+    st.write(f"캐시 적중률: {hit_rate:.0%} ({run_stats['cache_hits']}/{word_count} 단어, API 요청 단어 {run_stats['cache_misses']}개)")
+    if run_stats["duplicates"]:
+        st.write(f"중복 단어: {run_stats['duplicates']}개 (한 번만 요청하고 결과를 복사)")
+    if run_stats["resumed"]:
+        st.write(f"이전 실행에서 이어받은 단어: {run_stats['resumed']}개")
+    st.write(f"API 요청 횟수: {run_stats['batches']}회")
+    if run_stats["retries"]:
+        st.write(f"재요청 단어 수: {run_stats['retries']}개 (최종 실패 {run_stats['failed']}개)")
+    st.write(result_df)
+
+    # ✅ 다운로드 파일은 버튼을 누를 때 만들고(openpyxl, python-pptx도 이때 가져옴), 결과가 바뀔 때만 새로 생성
+    # 버튼 함수는 스크립트 밖의 스레드에서 실행되므로 세션 상태 대신 그 안의 dict에 보관
+    export_store = st.session_state.setdefault("export_store", {})
+    st.download_button(
+        label="결과 다운로드 (엑셀)",
+        data=lambda: cached_export(export_store, job_id, "xlsx", report.timed("write_excel", write_to_excel), result_df),
+        file_name="translated_vocabulary.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        key="download-btn"
+    )
+    if variant.has_pptx:
+        # 단어가 많으면 여러 파일로 나눈 zip
+        pptx_extension = pptx_file_extension(len(result_df))
+        st.download_button(
+            label="결과 다운로드 (파워포인트)",
+            data=lambda: cached_export(export_store, job_id, "pptx", report.timed("write_pptx", write_to_pptx), result_df)[0],
+            file_name=f"translated_vocabulary.{pptx_extension}",
+            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation" if pptx_extension == "pptx" else "application/zip",
+            key="download-pptx"
+        )
+
+    # ✅ 단계별 소요 시간과 사용량 (JSON / Prometheus 형식으로 내려받기)
+    with st.expander("실행 보고서 (단계별 소요 시간)"):
+        st.dataframe(pd.DataFrame.from_dict(report.stages(), orient="index"))
+        st.json(report.to_dict()["values"])
+        st.download_button(
+            label="보고서 다운로드 (JSON)",
+            data=report.to_json(),
+            file_name="run_report.json",
+            mime="application/json",
+            key="download-report-json"
+        )
+        st.download_button(
+            label="보고서 다운로드 (Prometheus)",
+            data=report.to_prometheus(),
+            file_name="run_report.prom",
+            mime="text/plain",
+            key="download-report-prom"
+        )
+
+
+def render(variant):
+    """비밀번호 확인 뒤의 앱 화면 전체를 그림 (variant: word_core.VARIANTS의 번역 방식)"""
+    st.title("단어 번역 및 예문 생성기")
+    st.write("엑셀 파일을 업로드하면 단어에 대한 IPA 발음, 번역, 예문을 자동 생성합니다.")
+
+    # 주소에 세션 id를 남겨 두어 페이지를 새로 고쳐도 같은 작업 목록을 봄
+    if "session" not in st.query_params:
+        st.query_params["session"] = uuid.uuid4().hex
+    session_id = st.query_params["session"]
+    # 모든 세션이 함께 쓰는 작업 대기열 (OpenAI 클라이언트는 첫 작업을 실행할 때 만듦)
+    queue = get_default_queue(st.secrets["OPENAI_API_KEY"])
+
+    _show_upload(variant, queue, session_id)
+
+    jobs = queue.store.list(session=session_id, variant=variant.name)
+    st.session_state.finished_jobs = [job["id"] for job in jobs if job["status"] in FINISHED]
+    if jobs:
+        st.subheader("번역 작업")
+        active = len(st.session_state.finished_jobs) < len(jobs)
+        st.fragment(_show_jobs, run_every=JOB_POLL_SECONDS if active else None)(variant, queue, session_id)
+
+    done_jobs = {job["id"]: job for job in jobs if job["status"] == DONE}
+    if done_jobs:
+        _show_results(variant, queue, done_jobs)
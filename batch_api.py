@@ -0,0 +1,190 @@
+"""급하지 않은 대량 단어 목록용 OpenAI Batch API 모드
+
+generate_batch_translations와 같은 프롬프트를 JSONL 배치 파일로 만들어 제출하고,
+완료될 때까지 기다린 뒤 결과를 result_df와 같은 행 형태로 돌려준다.
+단어 묶음 하나가 custom_id 하나가 되며, 진행 상태는 매니페스트 파일에 저장해서
+중간에 끊겨도 같은 배치를 다시 기다릴 수 있다.
+"""
+import json
+import os
+import tempfile
+import time
+from collections import deque
+
+from batch_planner import BatchPlanner
+from batch_runner import MISSING_TRANSLATION, assign_rows, stamp_rows
+from response_parser import parse_translations
+from row_model import is_valid_row
+from translation_cache import normalize_word
+from usage_metrics import usd_cost
+
+# ✅ Batch API 설정
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+BATCH_DISCOUNT = 0.5  # Batch API는 일반 요청 가격의 절반
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+# ✅ 단어 묶음 구성 (custom_id → 단어 위치 목록)
+def plan_groups(words, variant):
+    planner = BatchPlanner(completion_tokens_per_word=variant.completion_tokens_per_word)
+    pending = deque(range(len(words)))
+    groups = {}
+    while pending:
+        groups[f"group-{len(groups):05d}"] = planner.take(pending, words)
+    return groups
+
+
+# ✅ 배치 입력 JSONL 파일 작성
+def write_batch_file(path, words, groups, variant):
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, positions in groups.items():
+            request = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": variant.request([words[p] for p in positions]),
+            }
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+
+def _save_manifest(path, manifest):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+# ✅ 배치 제출 (이미 제출한 매니페스트가 있으면 그 배치를 그대로 사용)
+def submit_batch(client, words, variant, work_dir, name, cache=None):
+    """캐시에 없는 단어만 배치로 제출하고 매니페스트(dict)를 반환"""
+    manifest_path = os.path.join(work_dir, f"{name}.batch.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["words"] == [str(word) for word in words] and manifest["variant"] == variant.name:
+            return manifest
+
+    cached = cache.get_many(words, variant.cache_namespace) if cache is not None else {}
+    # 같은 단어는 처음 나온 위치만 제출하고 나머지는 결과를 받을 때 복사
+    first_positions = {}
+    for position, word in enumerate(words):
+        key = normalize_word(word)
+        if key not in cached:
+            first_positions.setdefault(key, position)
+    misses = list(first_positions.values())
+    groups = {custom_id: [misses[p] for p in positions]
+              for custom_id, positions in plan_groups([words[p] for p in misses], variant).items()}
+
+    manifest = {"name": name, "variant": variant.name, "words": [str(word) for word in words],
+                "groups": groups, "batch_id": None, "path": manifest_path}
+    if groups:
+        # 입력 파일은 업로드만 하면 되므로 결과 폴더가 아닌 임시 폴더에 만들고 바로 지움
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, f"{name}.batch_input.jsonl")
+            write_batch_file(input_path, words, groups, variant)
+            with open(input_path, "rb") as f:
+                input_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata={"variant": variant.name, "name": name},
+        )
+        manifest["batch_id"] = batch.id
+    _save_manifest(manifest_path, manifest)
+    return manifest
+
+
+# ✅ 배치가 끝날 때까지 주기적으로 상태 확인
+def wait_for_batch(client, batch_id, poll_seconds=30, timeout=None, on_status=None):
+    started = time.monotonic()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if on_status is not None:
+            on_status(batch)
+        if batch.status in FINAL_STATUSES:
+            return batch
+        if timeout is not None and time.monotonic() - started > timeout:
+            raise TimeoutError(f"배치 {batch_id}가 {timeout}초 안에 끝나지 않았습니다 (상태: {batch.status})")
+        time.sleep(poll_seconds)
+
+
+def _read_jsonl(client, file_id):
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ✅ 배치 결과를 입력 순서의 결과 행으로 변환
+def collect_results(client, manifest, batch, variant, cache=None):
+    """결과 행 목록(입력 순서)과 통계를 반환. 응답이 없거나 실패한 단어는 variant.error_row로 채운다."""
+    words = manifest["words"]
+    keys = [normalize_word(word) for word in words]
+    slots = [None] * len(words)
+
+    grouped = set(position for positions in manifest["groups"].values() for position in positions)
+    owners = {keys[position]: position for position in grouped}
+    rest = [position for position in range(len(words)) if position not in grouped]
+    cached = cache.get_many([keys[p] for p in rest if keys[p] not in owners], variant.cache_namespace) \
+        if cache is not None else {}
+    for position in rest:
+        if keys[position] not in owners and keys[position] in cached:
+            slots[position] = stamp_rows([cached[keys[position]]], words[position])
+
+    duplicates = [position for position in rest if keys[position] in owners]
+    stats = {"cache_hits": len(rest) - len(duplicates), "duplicates": len(duplicates), "groups": len(manifest["groups"]),
+             "failed": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    errors = {}
+    results = []
+    if batch is not None:
+        results = _read_jsonl(client, batch.output_file_id)
+        for line in _read_jsonl(client, getattr(batch, "error_file_id", None)):
+            errors[line["custom_id"]] = (line.get("error") or {}).get("message", "배치 요청 실패")
+
+    for line in results:
+        positions = manifest["groups"].get(line["custom_id"])
+        if positions is None:
+            continue
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        if response.get("status_code") != 200 or not body.get("choices"):
+            errors[line["custom_id"]] = (line.get("error") or {}).get("message") or f"HTTP {response.get('status_code')}"
+            continue
+        usage = body.get("usage") or {}
+        stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        stats["completion_tokens"] += usage.get("completion_tokens", 0)
+        output = body["choices"][0]["message"]["content"].strip()
+        rows = variant.make_rows(parse_translations(output))
+        cacheable = assign_rows(positions, keys, rows, slots, is_valid_row)
+        if cache is not None:
+            cache.put_many(cacheable, variant.cache_namespace)
+
+    reason_by_position = {p: errors.get(custom_id, "배치 결과에서 누락됨")
+                          for custom_id, positions in manifest["groups"].items() for p in positions}
+    for position in grouped:
+        if not slots[position]:
+            slots[position] = [variant.error_row(words[position], reason_by_position[position])]
+    for position in duplicates:
+        slots[position] = stamp_rows(slots[owners[keys[position]]], words[position])
+    for position in range(len(words)):
+        if not slots[position]:
+            slots[position] = [variant.error_row(words[position], "배치 결과에서 누락됨")]
+        if slots[position][0][2] == MISSING_TRANSLATION:
+            stats["failed"] += 1
+
+    stats["usd_cost"] = usd_cost(variant.model, stats["prompt_tokens"], stats["completion_tokens"]) * BATCH_DISCOUNT
+    return [row for rows in slots for row in rows], stats
+
+
+# ✅ 제출 → 대기 → 결과 변환을 한 번에
+def run_batch_job(client, words, variant, work_dir, name, cache=None, poll_seconds=30, timeout=None, on_status=None):
+    manifest = submit_batch(client, words, variant, work_dir, name, cache=cache)
+    batch = None
+    if manifest["batch_id"]:
+        batch = wait_for_batch(client, manifest["batch_id"], poll_seconds=poll_seconds, timeout=timeout, on_status=on_status)
+    translations, stats = collect_results(client, manifest, batch, variant, cache=cache)
+    stats["batch_id"] = manifest["batch_id"]
+    stats["batch_status"] = batch.status if batch is not None else "skipped"
+    # 끝난 배치의 매니페스트는 지워서 다음 실행 때 새로 제출
+    os.remove(manifest["path"])
+    return translations, stats
@@ -0,0 +1,61 @@
+import math
+
+# tiktoken이 설치되어 있으면 실제 토크나이저로, 없으면 글자 수 기준으로 토큰 수를 추정
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+
+# ✅ 로컬 토큰 수 추정
+def estimate_tokens(text):
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / 4) + 1
+
+
+class BatchPlanner:
+    """토큰 예산에 맞춰 배치를 구성하고, 응답 결과에 따라 예산을 늘리거나 줄이는 배치 계획기
+
+    응답이 빠르고 모든 단어가 번역되면 출력 예산을 조금씩 늘리고,
+    JSON이 잘리거나 번역이 빠진 단어가 있으면 예산을 절반으로 줄인다.
+    """
+
+    def __init__(self, completion_tokens_per_word=45, initial_batch_words=10, prompt_token_budget=1500,
+                 max_completion_tokens=3000, min_completion_tokens=100, max_batch_words=50, fast_seconds=20):
+        self.completion_tokens_per_word = completion_tokens_per_word
+        self.prompt_token_budget = prompt_token_budget
+        self.max_completion_tokens = max_completion_tokens
+        self.min_completion_tokens = min_completion_tokens
+        self.max_batch_words = max_batch_words
+        self.fast_seconds = fast_seconds
+        self.completion_token_budget = min(completion_tokens_per_word * initial_batch_words, max_completion_tokens)
+        self._step = completion_tokens_per_word * 5
+
+    def word_cost(self, word):
+        """단어 하나의 (프롬프트, 출력) 예상 토큰 수"""
+        tokens = estimate_tokens(str(word))
+        # 출력에는 단어와 발음기호가 다시 들어가므로 단어 길이만큼 더 늘어남
+        return tokens + 2, self.completion_tokens_per_word + 2 * tokens
+
+    def take(self, pending, words):
+        """pending(위치 deque)에서 예산 안에 들어가는 만큼 꺼내 배치를 구성 (최소 1단어)"""
+        batch = []
+        prompt_tokens = completion_tokens = 0
+        while pending and len(batch) < self.max_batch_words:
+            prompt_cost, completion_cost = self.word_cost(words[pending[0]])
+            if batch and (prompt_tokens + prompt_cost > self.prompt_token_budget
+                          or completion_tokens + completion_cost > self.completion_token_budget):
+                break
+            batch.append(pending.popleft())
+            prompt_tokens += prompt_cost
+            completion_tokens += completion_cost
+        return batch
+
+    def record(self, batch_words, translated_words, latency):
+        """배치 결과를 반영해 다음 배치의 출력 예산을 조정"""
+        if translated_words < batch_words:
+            self.completion_token_budget = max(self.min_completion_tokens, self.completion_token_budget // 2)
+        elif latency <= self.fast_seconds:
+            self.completion_token_budget = min(self.max_completion_tokens, self.completion_token_budget + self._step)
@@ -0,0 +1,291 @@
+import heapq
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from batch_planner import BatchPlanner
+from translation_cache import normalize_word
+
+# ✅ 동시에 진행할 최대 배치 요청 수 (기본값)
+DEFAULT_CONCURRENCY = 4
+
+# ✅ 누락/실패 단어 재요청 설정 (지수 백오프 + 지터)
+DEFAULT_MAX_ATTEMPTS = 3
+# 429(요청 한도 초과)는 max_attempts에 세지 않고 따로 세는 단어별 최대 횟수 (기다리는 시간은 RateLimiter가 정함)
+DEFAULT_MAX_RATE_LIMITED = 20
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+# ✅ 제너레이터 입력을 한 번에 읽어 캐시를 조회할 단어 수
+FEED_CHUNK_WORDS = 500
+
+# 번역 실패 행의 Korean 값 (캐시에 저장하지 않음)
+MISSING_TRANSLATION = "번역 없음"
+
+
+def stamp_rows(rows, word):
+    """복사한 행의 Word를 입력 단어 그대로로 바꿈 (캐시나 같은 단어의 행은 다른 철자로 요청한 결과일 수 있음)"""
+    return [[word, *row[1:]] for row in rows]
+
+
+def _is_translated(slot, validate=None):
+    return bool(slot) and slot[0][2] != MISSING_TRANSLATION and (validate is None or validate(slot[0]))
+
+
+# ✅ 응답 행을 요청한 단어 위치에 배정
+def assign_rows(positions, keys, rows, slots, validate=None):
+    """응답 행을 같은 단어의 위치에 배정하고, 캐시에 저장할 {단어: 행} 을 반환
+    (validate(행)이 False인 행은 배정하되 캐시에는 저장하지 않음)"""
+    waiting = {}
+    for position in positions:
+        waiting.setdefault(keys[position], []).append(position)
+        slots[position] = []
+
+    cacheable = {}
+    leftovers = []
+    for row in rows:
+        key = normalize_word(row[0])
+        if waiting.get(key):
+            slots[waiting[key].pop(0)].append(row)
+            if _is_translated([row], validate):
+                cacheable[key] = row
+        else:
+            leftovers.append(row)
+
+    # 모델이 단어 철자를 바꿔서 돌려준 행은 남은 위치가 하나뿐이거나 철자가 비슷한 위치가 하나뿐일 때만 배정
+    # (그 밖의 위치는 비워 두어 run_batches가 다시 요청)
+    unmatched = [position for position in positions if not slots[position]]
+    if len(unmatched) == 1 and len(leftovers) == 1:
+        slots[unmatched[0]].append(leftovers[0])
+        return cacheable
+    for row in leftovers:
+        key = normalize_word(row[0])
+        close = [position for position in unmatched if not slots[position] and _is_close(keys[position], key)]
+        if close and len({keys[position] for position in close}) == 1:
+            slots[close[0]].append(row)
+    return cacheable
+
+
+def _is_close(word, other):
+    """복수형(s, es, y → ies)이거나 편집 거리가 1 이하인지"""
+    for a, b in ((word, other), (other, word)):
+        if b in (a + "s", a + "es") or (a.endswith("y") and b == a[:-1] + "ies"):
+            return True
+    if abs(len(word) - len(other)) > 1:
+        return False
+    if len(word) > len(other):
+        word, other = other, word
+    # 짧은 쪽에 한 글자를 넣거나(길이가 다를 때) 한 글자를 바꿔서(길이가 같을 때) 같아지는지
+    for i, (a, b) in enumerate(zip(word, other)):
+        if a != b:
+            return word[i + (len(word) == len(other)):] == other[i + 1:]
+    return True
+
+
+def _retry_delay(attempt):
+    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.5)
+
+
+# ✅ 배치 동시 요청 함수
+def run_batches(words, translate_fn, error_row, planner=None, concurrency=DEFAULT_CONCURRENCY, on_progress=None,
+                on_rows=None, cache=None, cache_namespace="", checkpoint=None, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                validate=None, max_rate_limited=DEFAULT_MAX_RATE_LIMITED):
+    """캐시에 없는 단어만 배치 계획기에 따라 배치로 묶어 최대 concurrency개까지 동시에 요청하고,
+    결과 행 목록(입력 순서)과 실행 통계를 반환.
+
+    응답에서 빠졌거나 번역되지 않은 단어, validate(행)에서 걸린 단어, 요청 자체가 실패한 단어만
+    백오프 후 다음 배치에 합쳐서 재요청하고, max_attempts번 모두 실패하면 마지막 응답 행을 그대로
+    두거나(응답이 없었으면 error_row(단어, 사유)로 채움) 실패로 센다. 429 응답은 여러 세션이 한도를
+    함께 쓸 때 생기므로 max_attempts 대신 max_rate_limited번까지 따로 센다.
+
+    대소문자나 공백만 다른 같은 단어는 한 번만 요청하고 결과를 나머지 위치에 복사하므로,
+    결과는 항상 입력 한 줄당 한 행이다. 복사하거나 캐시, 체크포인트에서 가져온 행의 Word는
+    그 위치의 입력 단어로 바꾼다.
+
+    단어가 완료될 때마다 on_rows(새로 완료된 행 목록)를 호출하고 번역된 행은 checkpoint에 기록하므로,
+    중단된 실행을 같은 checkpoint로 다시 호출하면 번역된 위치는 건너뛰고 실패한 위치는 다시 요청한다.
+
+    words가 목록이 아니라 제너레이터면 FEED_CHUNK_WORDS개씩 필요할 때만 읽으므로 파일을
+    끝까지 읽기 전에 첫 요청이 나간다. 이때 on_progress의 전체 수는 지금까지 읽은 단어 수다.
+    """
+    if planner is None:
+        planner = BatchPlanner()
+
+    def is_translated(slot):
+        return _is_translated(slot, validate)
+
+    source = iter(words)
+    chunk_words = None if isinstance(words, (list, tuple)) else FEED_CHUNK_WORDS
+    words, keys, slots, attempts, rate_limited = [], [], [], [], []
+    exhausted = False
+
+    resumed = checkpoint.load() if checkpoint is not None else {}
+    pending = deque()
+    finished = []  # 이번에 새로 완료된 위치
+    stats = {"words": 0, "resumed": 0, "cache_hits": 0, "cache_misses": 0, "duplicates": 0, "batches": 0,
+             "retries": 0, "failed": 0}
+    completed_words = 0
+    # 같은 단어(대소문자, 공백 차이 포함)는 한 번만 요청하고 결과를 나머지 위치에 복사
+    owners = {}  # 정규화된 단어 → 결과를 가진(또는 요청 중인) 위치
+    duplicates = {}  # 요청 중인 위치 → 결과를 기다리는 같은 단어 위치 목록
+
+    def flush_finished():
+        if on_rows is not None:
+            on_rows([row for position in sorted(finished) for row in slots[position]])
+        if checkpoint is not None:
+            # 실패 행(429 등으로 재요청 횟수를 다 쓴 단어)은 기록하지 않아 이어서 실행할 때 다시 요청
+            checkpoint.append({position: slots[position] for position in finished if is_translated(slots[position])})
+        finished.clear()
+
+    def copy_rows(owner, position):
+        # 캐시 적중과 같이 먼저 요청한 위치의 행을 사용 (Word는 이 위치의 철자로)
+        slots[position] = stamp_rows(slots[owner], words[position])
+
+    def complete(position):
+        """요청한 위치와 결과를 기다리던 같은 단어 위치를 완료 처리"""
+        nonlocal completed_words
+        for target in [position, *duplicates.pop(position, [])]:
+            if target != position:
+                copy_rows(position, target)
+            if not is_translated(slots[target]):
+                stats["failed"] += 1
+            completed_words += 1
+            finished.append(target)
+
+    def feed(limit=None):
+        """다음 단어 묶음을 읽어 체크포인트, 캐시 순으로 채우고 나머지는 대기열에 추가"""
+        nonlocal exhausted, completed_words
+        chunk = list(source) if limit is None else list(islice(source, limit))
+        exhausted = limit is None or len(chunk) < limit
+        start = len(words)
+        words.extend(chunk)
+        keys.extend(normalize_word(word) for word in chunk)
+        slots.extend([None] * len(chunk))
+        attempts.extend([0] * len(chunk))
+        rate_limited.extend([0] * len(chunk))
+
+        # 예전 체크포인트에 남은 실패 행은 건너뛰고 캐시 조회, 요청 대상으로 되돌림
+        restored = [position for position in range(start, len(words))
+                    if position in resumed and is_translated(resumed[position])]
+        for position in restored:
+            slots[position] = stamp_rows(resumed[position], words[position])
+            owners.setdefault(keys[position], position)
+        remaining = [position for position in range(start, len(words)) if slots[position] is None]
+        cached = cache.get_many([keys[position] for position in remaining], cache_namespace) if cache is not None else {}
+        hits = misses = copied = waiting = 0
+        for position in remaining:
+            key = keys[position]
+            owner = owners.get(key)
+            if key in cached:
+                slots[position] = stamp_rows([cached[key]], words[position])
+                finished.append(position)
+                hits += 1
+            elif owner is None:
+                owners[key] = position
+                duplicates[position] = []
+                pending.append(position)
+                misses += 1
+            elif owner in duplicates:
+                duplicates[owner].append(position)
+                waiting += 1
+            else:
+                copy_rows(owner, position)
+                if not is_translated(slots[position]):
+                    stats["failed"] += 1
+                finished.append(position)
+                copied += 1
+
+        stats["resumed"] += len(restored)
+        stats["cache_hits"] += hits
+        stats["cache_misses"] += misses
+        stats["duplicates"] += copied + waiting
+        completed_words += len(restored) + hits + copied
+        if restored and on_rows is not None:
+            on_rows([row for position in restored for row in slots[position]])
+        if finished:
+            flush_finished()
+        if on_progress is not None and len(restored) + hits + copied:
+            on_progress(completed_words, len(words))
+
+    feed(chunk_words)
+
+    retry_queue = []  # (재요청 가능 시각, 위치)
+    in_flight = {}
+
+    def finish(position, reason):
+        if not slots[position]:
+            slots[position] = [error_row(words[position], reason)]
+        complete(position)
+
+    def requeue_or_finish(position, reason):
+        if attempts[position] < max_attempts:
+            heapq.heappush(retry_queue, (time.monotonic() + _retry_delay(attempts[position]), position))
+            stats["retries"] += 1
+        else:
+            finish(position, reason)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        while pending or in_flight or retry_queue or not exhausted:
+            # 제너레이터 입력은 대기 단어가 모자랄 때만 다음 묶음을 읽음
+            while not exhausted and len(pending) < planner.max_batch_words * max(1, concurrency):
+                feed(chunk_words)
+
+            # 백오프가 끝난 재요청 단어는 다음 배치 맨 앞에 합침
+            now = time.monotonic()
+            ready = []
+            while retry_queue and retry_queue[0][0] <= now:
+                ready.append(heapq.heappop(retry_queue)[1])
+            pending.extendleft(reversed(ready))
+
+            # 빈 자리가 생길 때마다 현재 예산으로 다음 배치를 구성해서 요청
+            while pending and len(in_flight) < max(1, concurrency):
+                batch = planner.take(pending, words)
+                for position in batch:
+                    attempts[position] += 1
+                future = executor.submit(translate_fn, [words[position] for position in batch])
+                in_flight[future] = (batch, time.monotonic())
+                stats["batches"] += 1
+
+            if not in_flight:
+                if retry_queue:
+                    time.sleep(max(0.0, retry_queue[0][0] - time.monotonic()))
+                continue
+
+            # 완료되는 순서대로 진행률을 갱신 (Streamlit 요소는 호출한 스레드에서만 갱신)
+            timeout = max(0.0, retry_queue[0][0] - time.monotonic()) if retry_queue else None
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, started = in_flight.pop(future)
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    # 429/5xx 같은 요청 실패는 배치 크기와 무관하므로 예산을 줄이지 않음
+                    throttled = getattr(e, "status_code", None) == 429
+                    for position in batch:
+                        if throttled and rate_limited[position] < max_rate_limited:
+                            # 429는 재요청 횟수에서 빼고 따로 셈 (RateLimiter가 모든 요청을 잠시 멈춤)
+                            rate_limited[position] += 1
+                            attempts[position] -= 1
+                        requeue_or_finish(position, str(e))
+                else:
+                    cacheable = assign_rows(batch, keys, rows, slots, validate)
+                    if cache is not None:
+                        cache.put_many(cacheable, cache_namespace)
+                    translated = [position for position in batch if is_translated(slots[position])]
+                    planner.record(len(batch), len(translated), time.monotonic() - started)
+                    for position in batch:
+                        if is_translated(slots[position]):
+                            complete(position)
+                        else:
+                            requeue_or_finish(position, "응답에서 누락됨")
+            if finished:
+                flush_finished()
+            if done and on_progress is not None:
+                on_progress(completed_words, len(words))
+
+    stats["words"] = len(words)
+    translations = [row for rows in slots for row in rows]
+    return translations, stats
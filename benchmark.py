@@ -0,0 +1,176 @@
+"""가짜 OpenAI 서버로 번역 파이프라인 처리량을 재는 벤치마크 (실제 API 비용 없음)
+
+    python benchmark.py --sizes 100 1000 10000 --latency 0.3 --error-rate 0.02 --rate-limit-rate 0.02 --malformed-rate 0.05
+
+번역 방식과 단어 수마다 별도 프로세스에서 가짜 서버를 띄우고, 업로드 파일 읽기 → 번역 →
+엑셀/파워포인트 생성까지 앱과 같은 경로로 실행한다. 초당 단어 수, 배치 응답 시간 p50/p95,
+재요청 수, 최대 메모리, 파일 생성 시간을 표로 출력하고 JSON으로 저장한다.
+번역 캐시와 체크포인트는 쓰지 않고, 사용량 기록도 임시 폴더에만 남긴다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from batch_runner import DEFAULT_CONCURRENCY
+from run_report import percentile
+from word_core import VARIANTS
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+# ✅ 중복 없는 가짜 단어 목록
+def make_words(count, seed=0):
+    rng = random.Random(seed)
+    words = {}
+    while len(words) < count:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        words.setdefault(word, None)
+    return list(words)
+
+
+def write_input(path, words):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(["Word"])
+    for word in words:
+        sheet.append([word])
+    workbook.save(path)
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+def _peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ✅ 번역 방식 하나, 단어 수 하나를 실행 (최대 메모리를 따로 재려고 새 프로세스에서 실행)
+def run_case(variant_name, size, options):
+    import pandas as pd
+
+    from fake_openai_server import start_server
+    from rate_limiter import RateLimiter
+    from usage_metrics import RunUsage, UsageStore
+    from word_core import create_client, translate_words, write_to_excel, write_to_pptx
+    from word_reader import iter_words
+
+    variant = VARIANTS[variant_name]
+    server, base_url = start_server(latency=options["latency"], error_rate=options["error_rate"],
+                                    rate_limit_rate=options["rate_limit_rate"],
+                                    malformed_rate=options["malformed_rate"], seed=options["seed"])
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            input_path = os.path.join(work_dir, "words.xlsx")
+            write_input(input_path, make_words(size, options["seed"]))
+
+            client = create_client("benchmark", base_url, max_retries=0)
+            limiter = RateLimiter(options["rpm"], options["tpm"], max_in_flight=options["concurrency"])
+            usage = RunUsage(variant.model, variant.prompt_version, store=UsageStore(os.path.join(work_dir, "usage.sqlite3")))
+
+            start = time.perf_counter()
+            translations, stats = translate_words(iter_words(input_path), client, variant, usage=usage,
+                                                  concurrency=options["concurrency"], limiter=limiter)
+            translate_seconds = time.perf_counter() - start
+
+            result_df = pd.DataFrame(translations, columns=variant.columns)
+            start = time.perf_counter()
+            write_to_excel(result_df)
+            excel_seconds = time.perf_counter() - start
+            pptx_seconds = None
+            if variant.has_pptx:
+                start = time.perf_counter()
+                write_to_pptx(result_df)
+                pptx_seconds = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        "variant": variant_name,
+        "words": size,
+        "seconds": round(translate_seconds, 3),
+        "words_per_second": round(size / translate_seconds, 1) if translate_seconds else None,
+        "batches": stats["batches"],
+        "retries": stats["retries"],
+        "failed": stats["failed"],
+        "rate_limited": limiter.stats["rate_limited"],
+        "p50_batch_seconds": _round(percentile(usage.latencies, 0.5)),
+        "p95_batch_seconds": _round(percentile(usage.latencies, 0.95)),
+        "excel_seconds": round(excel_seconds, 3),
+        "pptx_seconds": round(pptx_seconds, 3) if pptx_seconds is not None else None,
+        "peak_memory_mb": _round(_peak_memory_mb()),
+        "server": dict(server.RequestHandlerClass.state.counts),
+    }
+
+
+def _format(value, spec):
+    return format(value, spec) if value is not None else "-".rjust(len(format(0, spec)))
+
+
+def print_row(result):
+    print(f"{result['variant']:<12} {result['words']:>6} {_format(result['words_per_second'], '9.1f')} "
+          f"{_format(result['p50_batch_seconds'], '7.2f')} {_format(result['p95_batch_seconds'], '7.2f')} "
+          f"{result['retries']:>7} {result['failed']:>6} {result['rate_limited']:>5} "
+          f"{_format(result['peak_memory_mb'], '8.1f')} {_format(result['excel_seconds'], '7.2f')} "
+          f"{_format(result['pptx_seconds'], '7.2f')}", flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="가짜 OpenAI 서버로 번역 파이프라인 벤치마크")
+    parser.add_argument("--variants", nargs="+", choices=sorted(VARIANTS), default=sorted(VARIANTS), help="번역 방식 (기본: 전부)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="단어 수 (기본: 100 1000 10000)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="최대 동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.2, help="가짜 서버 평균 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 비율 (0~1)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="잘린 JSON 응답 비율 (0~1)")
+    parser.add_argument("--rpm", type=int, default=100000, help="요청 제한기 분당 요청 수 (실제 계정 한도를 흉내 낼 때 지정)")
+    parser.add_argument("--tpm", type=int, default=100000000, help="요청 제한기 분당 토큰 수 (실제 계정 한도를 흉내 낼 때 지정)")
+    parser.add_argument("--seed", type=int, default=0, help="단어 목록과 장애 주입 난수 시드")
+    parser.add_argument("--output", default="benchmark_results.json", help="결과 JSON 파일")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = {name: getattr(args, name) for name in
+               ("concurrency", "latency", "error_rate", "rate_limit_rate", "malformed_rate", "rpm", "tpm", "seed")}
+
+    print(f"{'variant':<12} {'words':>6} {'words/s':>9} {'p50(s)':>7} {'p95(s)':>7} {'retries':>7} "
+          f"{'failed':>6} {'429':>5} {'peak MB':>8} {'xlsx(s)':>7} {'pptx(s)':>7}")
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for variant_name in args.variants:
+        for size in args.sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_case, variant_name, size, options).result()
+            print_row(result)
+            results.append(result)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"options": options, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import time
+
+# ✅ 환율 조회 설정
+EXCHANGE_RATE_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+DEFAULT_KRW_RATE = 1300
+REFRESH_SECONDS = 6 * 60 * 60  # 성공한 환율은 6시간 동안 사용
+RETRY_SECONDS = 5 * 60  # 조회 실패 후 다시 시도하기까지의 간격
+REQUEST_TIMEOUT = 3
+RATE_FILE = os.environ.get(
+    "WORD_EXCHANGE_RATE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "exchange_rate.json")
+)
+
+# 프로세스 전체(모든 Streamlit 세션)에서 공유하는 환율 상태
+_lock = threading.Lock()
+_state = {"rate": None, "fetched_at": 0.0, "next_attempt": 0.0, "refreshing": False}
+
+
+def _load_last_known():
+    try:
+        with open(RATE_FILE, encoding="utf-8") as f:
+            saved = json.load(f)
+        return float(saved["rate"]), float(saved["fetched_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, 0.0
+
+
+def _save_last_known(rate, fetched_at):
+    try:
+        os.makedirs(os.path.dirname(RATE_FILE), exist_ok=True)
+        with open(RATE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"rate": rate, "fetched_at": fetched_at}, f)
+    except OSError:
+        pass
+
+
+def _refresh():
+    # requests는 백그라운드 갱신 스레드에서만 가져옴 (앱 시작 시간 단축)
+    import requests
+
+    try:
+        response = requests.get(EXCHANGE_RATE_URL, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        rate = float(response.json()["rates"]["KRW"])
+    except Exception:
+        with _lock:
+            _state["next_attempt"] = time.time() + RETRY_SECONDS
+            _state["refreshing"] = False
+        return
+
+    fetched_at = time.time()
+    _save_last_known(rate, fetched_at)
+    with _lock:
+        _state.update(rate=rate, fetched_at=fetched_at, next_attempt=fetched_at + REFRESH_SECONDS, refreshing=False)
+
+
+# ✅ 실시간 환율 가져오기 (네트워크를 기다리지 않고 캐시된 값을 바로 반환)
+def get_exchange_rate():
+    """캐시된 KRW/USD 환율을 반환하고, 오래되었으면 백그라운드에서 한 번만 갱신.
+    한 번도 조회하지 못했으면 마지막으로 저장된 값, 그것도 없으면 기본값 1300을 쓴다."""
+    with _lock:
+        if _state["rate"] is None:
+            rate, fetched_at = _load_last_known()
+            if rate is not None:
+                _state.update(rate=rate, fetched_at=fetched_at, next_attempt=fetched_at + REFRESH_SECONDS)
+        if not _state["refreshing"] and time.time() >= _state["next_attempt"]:
+            _state["refreshing"] = True
+            threading.Thread(target=_refresh, name="exchange-rate-refresh", daemon=True).start()
+        return _state["rate"] if _state["rate"] is not None else DEFAULT_KRW_RATE
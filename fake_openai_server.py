@@ -0,0 +1,234 @@
+"""테스트용 로컬 가짜 OpenAI 서버 (실제 API 비용 없이 파이프라인 확인용)
+
+    python fake_openai_server.py --port 8765
+    python word_cli.py uploads/ --api-key test --base-url http://127.0.0.1:8765/v1 --batch-api
+
+/v1/chat/completions, /v1/files, /v1/batches 를 흉내 낸다. 번역 결과는 단어를 그대로
+이용한 가짜 값이며, 배치는 제출 후 batch_seconds가 지나면 완료된다.
+벤치마크용으로 chat.completions 응답 지연, 500 오류, 429, 잘린 JSON 응답을 일정 비율로 섞을 수 있다.
+
+    python fake_openai_server.py --latency 0.5 --error-rate 0.02 --rate-limit-rate 0.02 --malformed-rate 0.05
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_WORDS = re.compile(r"Here are the words: (\[.*\])\.?\s*$", re.S)
+
+
+# ✅ 프롬프트에서 단어 목록을 꺼내 가짜 번역 응답 생성
+def fake_completion(body):
+    messages = body.get("messages", [])
+    match = _WORDS.search(messages[-1]["content"]) if messages else None
+    words = json.loads(match.group(1)) if match else []
+    items = [
+        {"word": str(word), "ipa": f"/{''.join(filter(str.isalpha, str(word).lower())) or 'ə'}/", "korean": f"{word}의 뜻",
+         "example": f"I see a {word}.", "example_korean": f"나는 {word}을 봐요."}
+        for word in words
+    ]
+    content = json.dumps({"translations": items}, ensure_ascii=False)
+    prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-3.5-turbo"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+class FakeOpenAIState:
+    """업로드된 파일과 배치, chat.completions 장애 주입 설정을 메모리에 보관"""
+
+    def __init__(self, batch_seconds=1.0, latency=0.0, error_rate=0.0, rate_limit_rate=0.0, malformed_rate=0.0,
+                 retry_after_ms=200, seed=None):
+        self.batch_seconds = batch_seconds
+        # 응답 지연 (초, 요청마다 0.5~1.5배로 흔들림)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after_ms = retry_after_ms
+        self.random = random.Random(seed)
+        self.counts = {"requests": 0, "errors": 0, "rate_limited": 0, "malformed": 0}
+        self.files = {}
+        self.batches = {}
+        self.lock = threading.Lock()
+
+    def pick_fault(self):
+        """이번 요청에 넣을 장애 ("error", "rate_limit", "malformed", None)와 지연 시간"""
+        with self.lock:
+            self.counts["requests"] += 1
+            roll = self.random.random()
+            delay = self.latency * self.random.uniform(0.5, 1.5)
+            for fault, rate, counter in (("rate_limit", self.rate_limit_rate, "rate_limited"),
+                                         ("error", self.error_rate, "errors"),
+                                         ("malformed", self.malformed_rate, "malformed")):
+                if roll < rate:
+                    self.counts[counter] += 1
+                    return fault, delay
+                roll -= rate
+            return None, delay
+
+    def add_file(self, content, filename, purpose):
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.files[file_id] = content
+        return {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                "filename": filename, "purpose": purpose, "status": "processed"}
+
+    def create_batch(self, body):
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batch = {
+            "id": batch_id, "object": "batch", "endpoint": body["endpoint"], "errors": None,
+            "input_file_id": body["input_file_id"], "completion_window": body["completion_window"],
+            "status": "in_progress", "output_file_id": None, "error_file_id": None,
+            "created_at": int(time.time()), "metadata": body.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self.lock:
+            self.batches[batch_id] = (batch, time.monotonic() + self.batch_seconds)
+        return batch
+
+    def get_batch(self, batch_id):
+        with self.lock:
+            batch, ready_at = self.batches[batch_id]
+            if batch["status"] == "in_progress" and time.monotonic() >= ready_at:
+                self._complete(batch)
+            return batch
+
+    def _complete(self, batch):
+        lines = self.files[batch["input_file_id"]].decode("utf-8").splitlines()
+        output = []
+        for line in filter(None, lines):
+            request = json.loads(line)
+            output.append({
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": fake_completion(request["body"])},
+                "error": None,
+            })
+        content = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in output).encode("utf-8")
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[file_id] = content
+        batch.update(status="completed", output_file_id=file_id, completed_at=int(time.time()),
+                     request_counts={"total": len(output), "completed": len(output), "failed": 0})
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    state = None  # make_server에서 지정
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chat_completion(self, body):
+        fault, delay = self.state.pick_fault()
+        time.sleep(delay)
+        if fault == "rate_limit":
+            self._send_json({"error": {"message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded"}},
+                            status=429, headers={"retry-after-ms": str(self.state.retry_after_ms)})
+            return
+        if fault == "error":
+            self._send_json({"error": {"message": "The server had an error (fake)", "type": "server_error"}}, status=500)
+            return
+        completion = fake_completion(body)
+        if fault == "malformed":
+            # 출력 한도에 걸려 잘린 것처럼 JSON 중간에서 끊음
+            message = completion["choices"][0]["message"]
+            message["content"] = message["content"][:int(len(message["content"]) * 0.6)]
+            completion["choices"][0]["finish_reason"] = "length"
+        self._send_json(completion)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        if self.path == "/v1/chat/completions":
+            self._chat_completion(json.loads(self._body()))
+        elif self.path == "/v1/files":
+            header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("latin-1")
+            message = BytesParser(policy=HTTP).parsebytes(header + self._body())
+            fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+            file_part = fields["file"]
+            self._send_json(self.state.add_file(file_part.get_payload(decode=True), file_part.get_filename(),
+                                                fields["purpose"].get_content().strip()))
+        elif self.path == "/v1/batches":
+            self._send_json(self.state.create_batch(json.loads(self._body())))
+        else:
+            self._send_json({"error": {"message": f"지원하지 않는 경로: {self.path}"}}, status=404)
+
+    def do_GET(self):
+        match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+        if match and match.group(1) in self.state.batches:
+            self._send_json(self.state.get_batch(match.group(1)))
+            return
+        match = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+        if match and match.group(1) in self.state.files:
+            data = self.state.files[match.group(1)]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        self._send_json({"error": {"message": f"찾을 수 없음: {self.path}"}}, status=404)
+
+
+# ✅ 서버 생성 (port=0이면 빈 포트 사용) → (서버, base_url). 장애 주입 설정은 FakeOpenAIState 참고
+def make_server(host="127.0.0.1", port=0, batch_seconds=1.0, **faults):
+    handler = type("Handler", (FakeOpenAIHandler,), {"state": FakeOpenAIState(batch_seconds, **faults)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+# ✅ 백그라운드 스레드에서 서버 실행
+def start_server(**kwargs):
+    server, base_url = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="fake-openai", daemon=True).start()
+    return server, base_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="테스트용 가짜 OpenAI 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-seconds", type=float, default=1.0, help="배치 완료까지 걸리는 시간")
+    parser.add_argument("--latency", type=float, default=0.0, help="chat.completions 평균 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 비율 (0~1)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="잘린 JSON 응답 비율 (0~1)")
+    parser.add_argument("--seed", type=int, help="장애 주입 난수 시드")
+    args = parser.parse_args(argv)
+    server, base_url = make_server(args.host, args.port, args.batch_seconds, latency=args.latency,
+                                   error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                                   malformed_rate=args.malformed_rate, seed=args.seed)
+    print(f"가짜 OpenAI 서버 실행 중: {base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
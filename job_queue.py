@@ -0,0 +1,269 @@
+"""번역 작업을 브라우저 세션과 떼어 백그라운드 작업자에서 실행하는 작업 대기열
+
+    queue = get_default_queue(api_key)
+    job_id = queue.submit(words, "word_pw", name="words.xlsx", session=session_id)
+    queue.store.get(job_id)   # 상태, 진행률, 사용량
+    queue.store.rows(job_id)  # 완료된 결과 행
+    queue.partial_rows(job_id)  # 실행 중인 작업에서 지금까지 완료된 행
+
+작업은 SQLite 작업 표에 저장하고 프로세스 전체가 함께 쓰는 작업자 스레드 몇 개가 차례로 실행한다.
+페이지를 새로 고치거나 세션이 끊겨도 작업은 계속되고, 서버가 다시 시작되면 끝나지 않은 작업을
+체크포인트에서 이어서 실행한다. Streamlit 앱은 작업을 넣고 상태만 조회해서 그린다.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_runner import DEFAULT_CONCURRENCY
+from rate_limiter import get_default_limiter
+from run_checkpoint import RunCheckpoint
+from run_report import RunReport
+from translation_cache import get_default_cache
+from usage_metrics import RunUsage
+from word_core import VARIANTS, get_shared_client, translate_words
+
+logger = logging.getLogger(__name__)
+
+# ✅ 작업 표 위치와 동시에 실행할 작업 수 (환경 변수로 변경 가능)
+DEFAULT_JOBS_PATH = os.environ.get(
+    "WORD_JOBS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "jobs.sqlite3")
+)
+DEFAULT_JOB_WORKERS = int(os.environ.get("WORD_JOB_WORKERS", 2))
+# 끝난 작업을 보관하는 기간
+DEFAULT_MAX_AGE_DAYS = 7
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+STATUS_LABELS = {QUEUED: "대기 중", RUNNING: "진행 중", DONE: "완료", FAILED: "실패"}
+
+_COLUMNS = ("id", "session", "variant", "name", "status", "done", "total", "concurrency", "run_id", "summary", "error",
+            "created_at", "started_at", "finished_at")
+
+
+class JobStore:
+    """작업별 입력 단어, 상태, 진행률, 결과 행을 저장하는 SQLite 작업 표"""
+
+    def __init__(self, path=DEFAULT_JOBS_PATH, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_age = max_age_days * 24 * 60 * 60
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, session TEXT, variant TEXT NOT NULL, name TEXT, status TEXT NOT NULL, "
+                "done INTEGER NOT NULL, total INTEGER NOT NULL, concurrency INTEGER NOT NULL, run_id TEXT, "
+                "summary TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+                "words TEXT NOT NULL, rows TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_session ON jobs (session, created_at)")
+
+    def create(self, words, variant, name=None, session=None, concurrency=DEFAULT_CONCURRENCY, run_id=None, summary=None):
+        """(작업 id, 새로 만들었는지)를 반환
+
+        run_id는 작업의 체크포인트 ID, summary는 작업을 넣을 때 정해지는 값 (예상 비용, 파일 읽기 시간).
+        같은 체크포인트를 쓰는 작업이 아직 끝나지 않았으면 새로 만들지 않고 그 작업 id를 반환한다.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            if run_id is not None:
+                record = self._conn.execute(
+                    "SELECT id FROM jobs WHERE run_id = ? AND status IN (?, ?)", (run_id, QUEUED, RUNNING)
+                ).fetchone()
+                if record:
+                    return record[0], False
+            # 오래된 끝난 작업 정리
+            self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({','.join('?' * len(FINISHED))}) AND finished_at < ?",
+                (*FINISHED, now - self.max_age),
+            )
+            self._conn.execute(
+                "INSERT INTO jobs (id, session, variant, name, status, done, total, concurrency, run_id, summary, created_at, words) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?, ?, ?)",
+                (job_id, session, variant, name, QUEUED, len(words), concurrency, run_id,
+                 json.dumps(summary, ensure_ascii=False) if summary is not None else None, now,
+                 json.dumps(words, ensure_ascii=False)),
+            )
+        return job_id, True
+
+    def _update(self, job_id, **values):
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values.values(), job_id))
+
+    def start(self, job_id):
+        self._update(job_id, status=RUNNING, started_at=time.time())
+
+    def progress(self, job_id, done, total):
+        self._update(job_id, done=done, total=total)
+
+    def finish(self, job_id, rows, summary):
+        self._update(job_id, status=DONE, done=len(rows), rows=json.dumps(rows, ensure_ascii=False),
+                     summary=json.dumps(summary, ensure_ascii=False), finished_at=time.time())
+
+    def fail(self, job_id, error, summary=None):
+        self._update(job_id, status=FAILED, error=str(error), finished_at=time.time(),
+                     summary=json.dumps(summary, ensure_ascii=False) if summary is not None else None)
+
+    def _select(self, where, params, limit=None):
+        query = f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE {where} ORDER BY created_at DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            records = self._conn.execute(query, params).fetchall()
+        jobs = [dict(zip(_COLUMNS, record)) for record in records]
+        for job in jobs:
+            job["summary"] = json.loads(job["summary"]) if job["summary"] else None
+        return jobs
+
+    def get(self, job_id):
+        """작업 상태 dict (입력 단어와 결과 행은 빼고). 없으면 None"""
+        jobs = self._select("id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def list(self, session=None, variant=None, limit=20):
+        """최근 작업부터 (session, variant를 주면 그 작업만)"""
+        conditions, params = [], []
+        for name, value in (("session", session), ("variant", variant)):
+            if value is not None:
+                conditions.append(f"{name} = ?")
+                params.append(value)
+        return self._select(" AND ".join(conditions) or "1", params, limit)
+
+    def active(self, run_id):
+        """같은 체크포인트를 쓰는 끝나지 않은 작업 (없으면 None)"""
+        jobs = self._select("run_id = ? AND status IN (?, ?)", (run_id, QUEUED, RUNNING), limit=1)
+        return jobs[0] if jobs else None
+
+    def unfinished(self):
+        """대기 중이거나 실행 중이던 작업 id (오래된 것부터)"""
+        return [job["id"] for job in reversed(self._select("status IN (?, ?)", (QUEUED, RUNNING)))]
+
+    def _column(self, job_id, name):
+        with self._lock:
+            record = self._conn.execute(f"SELECT {name} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(record[0]) if record and record[0] else None
+
+    def words(self, job_id):
+        return self._column(job_id, "words")
+
+    def rows(self, job_id):
+        """완료된 작업의 결과 행 목록 (끝나지 않았으면 None)"""
+        return self._column(job_id, "rows")
+
+
+class JobQueue:
+    """작업 표에 넣은 번역 작업을 작업자 스레드에서 실행 (모든 세션이 함께 씀)"""
+
+    def __init__(self, api_key, base_url=None, store=None, workers=DEFAULT_JOB_WORKERS):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.store = store if store is not None else JobStore()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="word-job")
+        # 서버가 다시 시작되기 전에 끝나지 않은 작업은 체크포인트에서 이어서 실행
+        for job_id in self.store.unfinished():
+            self._executor.submit(self._run, job_id)
+
+    def submit(self, words, variant, name=None, session=None, concurrency=DEFAULT_CONCURRENCY, estimate=None,
+               read_seconds=None):
+        """작업을 대기열에 넣고 작업 id를 바로 반환
+
+        같은 단어 목록과 방식의 작업이 아직 끝나지 않았으면 (체크포인트를 함께 쓰게 되므로) 그 작업 id를 반환한다.
+        estimate는 결과에 실제 값과 함께 보여 줄 예상 값 dict, read_seconds는 파일을 읽는 데 걸린 초
+        """
+        words = list(words)
+        checkpoint = RunCheckpoint.for_words(words, VARIANTS[variant].cache_namespace)
+        job_id, created = self.store.create(words, variant, name=name, session=session, concurrency=concurrency,
+                                            run_id=checkpoint.run_id,
+                                            summary={"estimate": estimate, "read_seconds": read_seconds})
+        if created:
+            self._executor.submit(self._run, job_id)
+        return job_id
+
+    def partial_rows(self, job_id):
+        """실행 중인 작업에서 지금까지 완료된 결과 행 (체크포인트를 입력 순서대로 읽음)"""
+        job = self.store.get(job_id)
+        if job is None or not job["run_id"]:
+            return []
+        saved_rows = RunCheckpoint(job["run_id"]).load()
+        return [row for position in sorted(saved_rows) for row in saved_rows[position]]
+
+    def _run(self, job_id):
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED:
+            return
+        words = self.store.words(job_id)
+        variant = VARIANTS[job["variant"]]
+        usage = RunUsage(variant.model, variant.prompt_version)
+        report = RunReport(variant=variant.name, job=job_id)
+        submitted = job["summary"] or {}
+        if submitted.get("read_seconds") is not None:
+            report.add("read_input", submitted["read_seconds"])
+        checkpoint = RunCheckpoint.for_words(words, variant.cache_namespace)
+        start_time = time.time()
+        self.store.start(job_id)
+
+        def summary(stats=None):
+            return {
+                "stats": stats,
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "usd_cost": usage.usd_cost,
+                "seconds": round(time.time() - start_time, 2),
+                "estimate": submitted.get("estimate"),
+                "report": report.dump(),
+            }
+
+        try:
+            translations, stats = translate_words(
+                words,
+                get_shared_client(self.api_key, self.base_url),
+                variant,
+                usage=usage,
+                concurrency=job["concurrency"],
+                cache=get_default_cache(),
+                checkpoint=checkpoint,
+                on_progress=lambda done, total: self.store.progress(job_id, done, total),
+                limiter=get_default_limiter(),
+                session=job["session"],
+                report=report,
+            )
+        except Exception as e:
+            logger.exception("번역 작업 %s 실패", job_id)
+            self.store.fail(job_id, e, summary())
+            return
+        report.log()
+        checkpoint.clear()
+        self.store.finish(job_id, translations, summary(stats))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def job_label(job):
+    """작업 목록에 보여 줄 이름 (파일 이름 · 추가한 시각)"""
+    created = time.strftime("%m-%d %H:%M", time.localtime(job["created_at"]))
+    return f"{job['name'] or job['id'][:8]} · {created}"
+
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+# ✅ 프로세스 전체(모든 Streamlit 세션)에서 공유하는 작업 대기열
+def get_default_queue(api_key, base_url=None):
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue(api_key, base_url)
+        return _default_queue
@@ -0,0 +1,122 @@
+"""앱 시작 시간과 위젯 조작 후 재실행 시간이 예산 안에 드는지 검사 (넘으면 종료 코드 1)
+
+    python perf_budget.py --words 5000
+
+1. 새 프로세스에서 앱이 가져오는 공용 모듈을 가져오는 시간을 잰다 (streamlit, pandas는 미리 가져온 뒤).
+   파일을 만들거나 요청할 때만 필요한 openai, openpyxl, python-pptx, requests가 함께 로드되면 실패로 본다.
+2. Streamlit AppTest로 앱마다 단어 파일을 올린 뒤 다시 실행(위젯을 조작할 때와 같은 재실행)하는
+   시간을 잰다. Go를 누르지 않으므로 API 요청은 보내지 않는다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark import make_words, write_input
+from run_report import percentile
+
+# ✅ 시간 예산 (초)
+IMPORT_BUDGET_SECONDS = float(os.environ.get("WORD_IMPORT_BUDGET", 0.25))
+RERUN_BUDGET_SECONDS = float(os.environ.get("WORD_RERUN_BUDGET", 0.5))
+
+APPS = ["word_pw.py", "word_pw_new.py", "word_pw_ppt.py"]
+# 앱이 시작할 때 가져오는 공용 모듈
+APP_MODULES = ["app_cache", "app_ui", "batch_runner", "job_queue", "rate_limiter", "run_checkpoint", "run_report", "translation_cache",
+               "usage_metrics", "word_core", "word_reader"]
+# 처음 필요할 때만 가져와야 하는 모듈
+LAZY_MODULES = ["openai", "openpyxl", "pptx", "requests"]
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+import pandas, streamlit
+loaded = set(sys.modules)
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "lazy_loaded": [name for name in {lazy!r} if name in sys.modules and name not in loaded]}}))
+"""
+
+
+# ✅ 새 프로세스에서 공용 모듈 가져오는 시간 (여러 번 재서 가장 짧은 값)
+def measure_imports(repeat=3):
+    script = _IMPORT_SCRIPT.format(modules=APP_MODULES, lazy=LAZY_MODULES)
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result["seconds"])
+
+
+# ✅ 파일을 올린 첫 실행과 그 뒤 재실행 시간
+def measure_reruns(app, upload, reruns=5):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=120)
+    at.secrets["APP_PASSWORD"] = "perf-budget"
+    at.secrets["OPENAI_API_KEY"] = "perf-budget"
+    at.session_state["password_correct"] = True
+    at.run()
+    at.file_uploader[0].set_value(upload)
+
+    start = time.perf_counter()
+    at.run()
+    first_seconds = time.perf_counter() - start
+    seconds = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        seconds.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(f"{app}: {at.exception[0].value}")
+    return first_seconds, percentile(seconds, 0.5), max(seconds)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="앱 시작 시간과 재실행 시간 예산 검사")
+    parser.add_argument("--apps", nargs="+", choices=APPS, default=APPS, help="검사할 앱 (기본: 전부)")
+    parser.add_argument("--words", type=int, default=5000, help="올릴 단어 파일의 단어 수")
+    parser.add_argument("--reruns", type=int, default=5, help="앱마다 재실행 횟수")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_SECONDS, help="공용 모듈 가져오기 예산 (초)")
+    parser.add_argument("--rerun-budget", type=float, default=RERUN_BUDGET_SECONDS, help="재실행 한 번의 예산 (초)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    failures = []
+
+    imports = measure_imports()
+    print(f"공용 모듈 가져오기: {imports['seconds']:.3f}초 (예산 {args.import_budget:.3f}초)")
+    if imports["seconds"] > args.import_budget:
+        failures.append("import")
+    if imports["lazy_loaded"]:
+        print(f"  처음 필요할 때 가져와야 하는 모듈이 로드됨: {', '.join(imports['lazy_loaded'])}")
+        failures.append("lazy imports")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "words.xlsx")
+        write_input(input_path, make_words(args.words))
+        with open(input_path, "rb") as f:
+            upload = ("words.xlsx", f.read(), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+    for app in args.apps:
+        first_seconds, p50_seconds, max_seconds = measure_reruns(app, upload, args.reruns)
+        print(f"{app:<16} 파일 업로드 {first_seconds:.3f}초, 재실행 p50 {p50_seconds:.3f}초 / 최대 {max_seconds:.3f}초 "
+              f"(예산 {args.rerun_budget:.3f}초)")
+        if max_seconds > args.rerun_budget:
+            failures.append(app)
+
+    if failures:
+        print(f"예산 초과: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""템플릿 슬라이드를 복제해서 단어 카드 파워포인트를 만드는 모듈
+
+템플릿의 첫 번째 슬라이드에 {Word}, {IPA}, {Korean}, {Example} 자리표시자를 넣어 두면
+단어마다 그 슬라이드의 도형(그림 등이 참조하는 관계 포함)을 복제하고 글자만 바꾼다.
+저장소에는 템플릿 파일을 넣어 두지 않으므로 기본으로는 기존과 같은 모양(제목 + 텍스트 상자)의
+템플릿을 메모리에서 만든다. 직접 만든 템플릿은 templates/vocabulary_template.pptx에 두거나
+WORD_PPTX_TEMPLATE 환경 변수로 경로를 지정한다.
+단어가 많으면 SLIDES_PER_FILE개씩 나눠 여러 프로세스에서 동시에 만들고 zip으로 묶는다.
+"""
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from io import BytesIO
+
+# ✅ 템플릿 위치와 파일 하나당 슬라이드 수
+DEFAULT_TEMPLATE_PATH = os.environ.get(
+    "WORD_PPTX_TEMPLATE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "vocabulary_template.pptx")
+)
+SLIDES_PER_FILE = 500
+# 슬라이드에 들어가는 결과 컬럼 (자리표시자 이름 → 컬럼)
+SLIDE_FIELDS = {"Word": "Word", "IPA": "IPA", "Korean": "Korean", "Example": "Combined Example"}
+# 도형이 그림, 하이퍼링크 등의 관계 ID를 적는 속성의 네임스페이스 (r:embed, r:link, r:id)
+_RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def _template_presentation(template_path):
+    # python-pptx는 파일을 만들 때만 가져옴 (앱 시작 시간 단축)
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    if template_path and os.path.exists(template_path):
+        return Presentation(template_path)
+
+    # 기존 write_to_pptx와 같은 모양의 템플릿 슬라이드
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "{Word}"
+    textbox = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(4.5))
+    textbox.text_frame.text = "IPA: {IPA}\n\nKorean: {Korean}\n\nExample: {Example}"
+    return prs
+
+
+def _remove_slide(prs, index):
+    slide_ids = prs.slides._sldIdLst
+    slide_id = list(slide_ids)[index]
+    prs.part.drop_rel(slide_id.rId)
+    slide_ids.remove(slide_id)
+
+
+def _copy_shape(element, source_part, target_part, rel_ids):
+    """도형을 복제하고 그 안의 관계 ID를 새 슬라이드의 관계로 바꿈 (rel_ids: 원래 ID → 새 ID)"""
+    copied = deepcopy(element)
+    for node in copied.iter():
+        for name, rel_id in node.attrib.items():
+            if not name.startswith(_RELATIONSHIP_NS) or rel_id not in source_part.rels:
+                continue
+            if rel_id not in rel_ids:
+                rel = source_part.rels[rel_id]
+                if rel.is_external:
+                    rel_ids[rel_id] = target_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                else:
+                    rel_ids[rel_id] = target_part.relate_to(rel.target_part, rel.reltype)
+            node.set(name, rel_ids[rel_id])
+    return copied
+
+
+def _replace_tokens(paragraph, values):
+    """문단의 자리표시자를 값으로 바꿈 (PowerPoint가 자리표시자를 여러 run으로 나눠 저장해도 바꿈)"""
+    runs = paragraph.runs
+    text = "".join(run.text for run in runs)
+    if "{" not in text:
+        return
+    replaced = text
+    for token, value in values.items():
+        replaced = replaced.replace(token, value)
+    if replaced != text:
+        # 첫 run의 서식을 유지하고 나머지 run은 비움
+        runs[0].text = replaced
+        for run in runs[1:]:
+            run.text = ""
+
+
+# ✅ 슬라이드 묶음 하나를 파일로 생성 (작업 프로세스에서 실행)
+def build_deck(rows, template_path=DEFAULT_TEMPLATE_PATH):
+    """rows: (Word, IPA, Korean, Example) 튜플 목록 → pptx 바이트"""
+    prs = _template_presentation(template_path)
+    template = prs.slides[0]
+    layout = template.slide_layout
+    shape_elements = [shape.element for shape in template.shapes]
+    names = list(SLIDE_FIELDS)
+
+    for row in rows:
+        values = {f"{{{name}}}": "" if value is None else str(value) for name, value in zip(names, row)}
+        slide = prs.slides.add_slide(layout)
+        # 레이아웃이 자동으로 만든 자리표시자는 지우고 템플릿 도형을 그대로 복제
+        tree = slide.shapes._spTree
+        for shape in list(slide.shapes):
+            tree.remove(shape.element)
+        rel_ids = {}
+        for element in shape_elements:
+            tree.append(_copy_shape(element, template.part, slide.part, rel_ids))
+
+        for shape in slide.shapes:
+            if not shape.has_text_frame:
+                continue
+            for paragraph in shape.text_frame.paragraphs:
+                _replace_tokens(paragraph, values)
+
+    _remove_slide(prs, 0)
+    output = BytesIO()
+    prs.save(output)
+    return output.getvalue()
+
+
+# ✅ 결과 표 → 파워포인트 (많으면 여러 파일을 동시에 만들고 zip으로 묶음)
+def export_extension(row_count, slides_per_file=SLIDES_PER_FILE):
+    """build_pptx_export가 만들 파일의 확장자 (파일을 만들기 전에 다운로드 이름을 정할 때 사용)"""
+    return "pptx" if row_count <= slides_per_file else "zip"
+
+
+def build_pptx_export(result_df, slides_per_file=SLIDES_PER_FILE, template_path=DEFAULT_TEMPLATE_PATH, max_workers=None):
+    """(바이트, 확장자)를 반환. 파일이 하나면 "pptx", 여러 개면 "zip"."""
+    rows = list(result_df[list(SLIDE_FIELDS.values())].itertuples(index=False, name=None))
+    chunks = [rows[i:i + slides_per_file] for i in range(0, len(rows), slides_per_file)] or [[]]
+    if export_extension(len(rows), slides_per_file) == "pptx":
+        return build_deck(chunks[0], template_path), "pptx"
+
+    workers = min(len(chunks), max_workers or os.cpu_count() or 1)
+    # 앱 서버는 여러 스레드가 도는 프로세스라 fork하면 자식이 멈출 수 있으므로 새 프로세스로 시작
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        decks = list(executor.map(build_deck, chunks, [template_path] * len(chunks)))
+
+    output = BytesIO()
+    width = len(str(len(decks)))
+    # pptx는 이미 압축된 파일이라 다시 압축하지 않고 묶기만 함
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index, deck in enumerate(decks, start=1):
+            archive.writestr(f"translated_vocabulary_{index:0{width}d}.pptx", deck)
+    return output.getvalue(), "zip"
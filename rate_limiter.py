@@ -0,0 +1,172 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+
+# ✅ 계정 사용 한도 기본값 (응답 헤더의 실제 한도를 받으면 그 값으로 바뀜)
+DEFAULT_REQUESTS_PER_MINUTE = int(os.environ.get("WORD_RPM", 3500))
+DEFAULT_TOKENS_PER_MINUTE = int(os.environ.get("WORD_TPM", 90000))
+# 429 응답에 기다릴 시간이 없을 때 모든 요청을 멈추는 시간
+RATE_LIMIT_PAUSE_SECONDS = 2.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+# ✅ "1s", "6m0s", "20ms" 같은 헤더 값 → 초
+def parse_duration(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _header_int(headers, name):
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(headers):
+    """429 응답 헤더에서 다시 요청해도 되는 시각까지 남은 초"""
+    milliseconds = parse_duration(headers.get("retry-after-ms"))
+    if milliseconds is not None:
+        return milliseconds / 1000
+    seconds = parse_duration(headers.get("retry-after"))
+    if seconds is not None:
+        return seconds
+    resets = [parse_duration(headers.get(name)) for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+class RateLimiter:
+    """분당 요청 수와 분당 토큰 수를 토큰 버킷으로 나눠 주는 프로세스 전체 요청 제한기
+
+    기다리는 요청은 세션별 대기열에 넣고 세션을 돌아가며 하나씩 보내므로, 한 사람이 큰 파일을
+    돌려도 다른 사람의 요청이 뒤로 밀리지 않는다. 응답 헤더(x-ratelimit-*)의 남은 한도를
+    반영하고, 429를 받으면 모든 세션의 요청을 잠시 멈춘다.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 max_in_flight=None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        # 동시에 진행 중인 요청 수 제한 (None이면 제한 없음)
+        self.max_in_flight = max_in_flight
+        self._condition = threading.Condition()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._queues = {}  # 세션 → 기다리는 요청 deque
+        self._turns = deque()  # 기다리는 요청이 있는 세션 (차례대로)
+        self.stats = {"requests": 0, "rate_limited": 0, "waited_seconds": 0.0}
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _wait_seconds(self, tokens, now):
+        """지금 차례인 요청이 보내질 수 있을 때까지 남은 시간 (0이면 바로 가능)"""
+        waits = [self._paused_until - now,
+                 (1 - self._requests) * 60 / self.requests_per_minute,
+                 (tokens - self._tokens) * 60 / self.tokens_per_minute]
+        return max(0.0, *waits)
+
+    def acquire(self, tokens, session=None):
+        """예상 토큰 수만큼 한도가 생기고 이 세션 차례가 올 때까지 기다린 뒤, 받은 토큰 수를 반환"""
+        ticket = object()
+        started = time.monotonic()
+        with self._condition:
+            tokens = min(tokens, self.tokens_per_minute)
+            if session not in self._queues:
+                self._queues[session] = deque()
+                self._turns.append(session)
+            self._queues[session].append(ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                my_turn = self._queues[self._turns[0]][0] is ticket
+                has_slot = self.max_in_flight is None or self._in_flight < self.max_in_flight
+                wait_seconds = self._wait_seconds(tokens, now) if my_turn else None
+                if my_turn and has_slot and wait_seconds == 0:
+                    break
+                self._condition.wait(wait_seconds if my_turn and has_slot else None)
+
+            self._requests -= 1
+            self._tokens -= tokens
+            self._in_flight += 1
+            # 이 세션은 다음 차례로 맨 뒤에
+            queue = self._queues[self._turns.popleft()]
+            queue.popleft()
+            if queue:
+                self._turns.append(session)
+            else:
+                del self._queues[session]
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += time.monotonic() - started
+            self._condition.notify_all()
+        return tokens
+
+    def release(self, tokens, used_tokens=None, headers=None, error=None):
+        """요청이 끝나면 호출. 실제 사용량과 응답 헤더를 반영하고, 429면 모든 요청을 잠시 멈춤"""
+        response = getattr(error, "response", None)
+        if headers is None and response is not None:
+            headers = getattr(response, "headers", None)
+        headers = headers or {}
+        rate_limited = error is not None and getattr(error, "status_code", None) == 429
+
+        with self._condition:
+            self._in_flight -= 1
+            if used_tokens is not None:
+                self._tokens += tokens - used_tokens
+            elif rate_limited:
+                # 거절된 요청은 토큰을 쓰지 않음
+                self._tokens += tokens
+            self._apply_headers(headers)
+            if rate_limited:
+                self.stats["rate_limited"] += 1
+                pause = _retry_after(headers)
+                self._paused_until = max(self._paused_until, time.monotonic() + (pause or RATE_LIMIT_PAUSE_SECONDS))
+            self._condition.notify_all()
+
+    def _apply_headers(self, headers):
+        limit_requests = _header_int(headers, "x-ratelimit-limit-requests")
+        limit_tokens = _header_int(headers, "x-ratelimit-limit-tokens")
+        if limit_requests:
+            self.requests_per_minute = limit_requests
+        if limit_tokens:
+            self.tokens_per_minute = limit_tokens
+        # 다른 프로세스나 다른 서버가 같은 키를 쓰면 서버가 알려 준 남은 한도가 더 작음
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if remaining_requests is not None:
+            self._requests = min(self._requests, remaining_requests)
+        if remaining_tokens is not None:
+            self._tokens = min(self._tokens, remaining_tokens)
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+# ✅ 프로세스 전체(모든 Streamlit 세션)에서 공유하는 요청 제한기
+def get_default_limiter():
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
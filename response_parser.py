@@ -0,0 +1,40 @@
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_OBJECT_START = re.compile(r"\{")
+
+
+def _clean_item(item):
+    """문자열 값만 남기고, 단어가 없는 항목은 버림"""
+    if not isinstance(item, dict):
+        return None
+    item = {key: value for key, value in item.items() if isinstance(value, str)}
+    return item if item.get("word", "").strip() else None
+
+
+# ✅ 모델 응답에서 번역 항목 추출 (일부가 깨진 JSON이어도 온전한 항목은 살림)
+def parse_translations(output):
+    """응답 문자열에서 {"word": ...} 항목 목록을 반환. JSON이 잘리거나 깨진 경우
+    "translations" 배열 안의 온전한 객체만 골라서 반환한다."""
+    try:
+        parsed = json.loads(output)
+        items = parsed.get("translations", []) if isinstance(parsed, dict) else []
+    except json.JSONDecodeError:
+        start = output.find('"translations"')
+        start = output.find("[", start) + 1 if start != -1 else 0
+        items = []
+        position = start
+        while True:
+            match = _OBJECT_START.search(output, position)
+            if match is None:
+                break
+            try:
+                item, position = _decoder.raw_decode(output, match.start())
+            except json.JSONDecodeError:
+                position = match.start() + 1
+                continue
+            items.append(item)
+    if not isinstance(items, list):
+        return []
+    return [item for item in map(_clean_item, items) if item is not None]
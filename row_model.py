@@ -0,0 +1,100 @@
+"""모델 응답 항목 → 결과 행 변환과 검증 (세 앱이 같은 규칙을 씀)
+
+정리 규칙은 모듈을 불러올 때 한 번만 만들어 두고, 배치 응답 전체를 한 번에 변환한다.
+검증에 걸린 행(발음기호가 이상하거나 뜻이 비어 있음)은 run_batches가 그 단어만 다시 요청한다.
+"""
+import re
+from operator import attrgetter
+
+from batch_runner import MISSING_TRANSLATION
+
+# ✅ 결과 행 규칙을 바꾸면 올려서 이전 규칙으로 저장된 캐시/체크포인트를 쓰지 않게 함
+ROW_VERSION = 2
+
+# 응답에 값이 없을 때 넣는 값
+MISSING_IPA = "발음 없음"
+MISSING_EXAMPLE = "No example available"
+MISSING_EXAMPLE_KOREAN = "예문 없음"
+
+# "@" → "ə", 슬래시와 대괄호는 지움 (이미 [ ] 로 감싼 응답을 다시 감싸지 않도록)
+_IPA_TABLE = str.maketrans({"@": "ə", "/": None, "[": None, "]": None})
+_SPACES = re.compile(r"\s+")
+# "사과 or 배", "사과 ,배" → "사과, 배"
+_KOREAN_SEPARATORS = re.compile(r"\s+or\s+|\s*,\s*")
+# 라틴 문자, IPA 기호/보조 기호, 그리스 문자(θ, β, χ), 강세·길이 표시와 구분 기호만 허용
+# (여러 발음을 나열한 "riːd, rɛd" 같은 응답도 정상으로 봄)
+_VALID_IPA = re.compile(r"[A-Za-zÀ-ͯͰ-Ͽᴀ-ᶿ‿'ː:.\-(),/ ]+")
+# 문맥상 약하게 발음되는 단어의 발음기호 (ex: "a cat")
+_WEAK_FORMS = {"a": "ə"}
+
+
+def _text(value):
+    return _SPACES.sub(" ", value).strip() if isinstance(value, str) else ""
+
+
+class TranslationRecord:
+    """응답 항목 하나를 정리한 결과 (모든 번역 방식이 같은 필드와 규칙을 씀)"""
+
+    __slots__ = ("word", "ipa", "korean", "example", "example_korean")
+
+    def __init__(self, word, ipa, korean, example, example_korean):
+        self.word = word
+        self.ipa = ipa
+        self.korean = korean
+        self.example = example
+        self.example_korean = example_korean
+
+    @classmethod
+    def from_item(cls, item):
+        word = _text(item.get("word"))
+        ipa = _WEAK_FORMS.get(word.lower()) or _text(_text(item.get("ipa")).translate(_IPA_TABLE))
+        korean = _KOREAN_SEPARATORS.sub(", ", _text(item.get("korean"))).strip(", ")
+        return cls(
+            word,
+            f"[ {ipa} ]" if ipa else MISSING_IPA,
+            korean or MISSING_TRANSLATION,
+            _text(item.get("example")) or MISSING_EXAMPLE,
+            _text(item.get("example_korean")) or MISSING_EXAMPLE_KOREAN,
+        )
+
+    @property
+    def combined_example(self):
+        return f"{self.example} ({self.example_korean})"
+
+
+# ✅ 결과 컬럼 → 레코드 값
+COLUMN_VALUES = {
+    "Word": attrgetter("word"),
+    "IPA": attrgetter("ipa"),
+    "Korean": attrgetter("korean"),
+    "Example Sentence": attrgetter("example"),
+    "Combined Example": attrgetter("combined_example"),
+    "English Example": attrgetter("example"),
+    "Korean Example": attrgetter("example_korean"),
+}
+
+
+# ✅ 결과 컬럼에 맞춰 응답 항목 목록 → 결과 행 목록 변환 함수를 만듦
+def make_row_builder(columns):
+    getters = [COLUMN_VALUES[column] for column in columns]
+
+    def build_rows(items):
+        return [[get(record) for get in getters] for record in map(TranslationRecord.from_item, items)]
+
+    return build_rows
+
+
+# ✅ 결과 행 검증 (모든 방식의 앞 세 컬럼은 Word, IPA, Korean)
+def row_issues(row):
+    """검증에 걸린 항목 목록 ("ipa", "korean"). 비어 있으면 정상"""
+    issues = []
+    ipa = row[1]
+    if ipa == MISSING_IPA or not _VALID_IPA.fullmatch(ipa[2:-2]):
+        issues.append("ipa")
+    if not row[2] or row[2] == MISSING_TRANSLATION:
+        issues.append("korean")
+    return issues
+
+
+def is_valid_row(row):
+    return not row_issues(row)
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import time
+
+# ✅ 체크포인트 파일 위치와 보관 기간
+DEFAULT_CHECKPOINT_DIR = os.environ.get(
+    "WORD_CHECKPOINT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "checkpoints")
+)
+CHECKPOINT_MAX_AGE_DAYS = 7
+
+
+class RunCheckpoint:
+    """완료된 단어 위치별 결과 행을 JSONL 파일에 이어서 기록하는 실행 체크포인트
+
+    같은 단어 목록과 네임스페이스로 다시 실행하면 기록된 위치는 건너뛰고 이어서 진행한다.
+    """
+
+    def __init__(self, run_id, directory=DEFAULT_CHECKPOINT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        self._remove_stale(directory)
+
+    @classmethod
+    def for_words(cls, words, namespace, directory=DEFAULT_CHECKPOINT_DIR):
+        """단어 목록과 모델/프롬프트 네임스페이스로 실행 ID를 만들어 체크포인트를 연다"""
+        digest = hashlib.sha256(json.dumps([namespace, [str(word) for word in words]], ensure_ascii=False).encode("utf-8"))
+        return cls(digest.hexdigest()[:32], directory)
+
+    @classmethod
+    def for_source(cls, path, namespace, options=(), directory=DEFAULT_CHECKPOINT_DIR):
+        """입력 파일 내용과 읽기 옵션(시트, 열)으로 실행 ID를 만든다 (단어를 미리 다 읽지 않아도 됨)"""
+        digest = hashlib.sha256(json.dumps([namespace, list(options)], ensure_ascii=False).encode("utf-8"))
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return cls(digest.hexdigest()[:32], directory)
+
+    @staticmethod
+    def _remove_stale(directory):
+        cutoff = time.time() - CHECKPOINT_MAX_AGE_DAYS * 24 * 60 * 60
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".jsonl") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+
+    def load(self):
+        """기록된 {위치: 행 목록} 을 반환 (중간에 끊겨 잘린 마지막 줄은 무시)"""
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[record["position"]] = record["rows"]
+        return done
+
+    def append(self, rows_by_position):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for position, rows in rows_by_position.items():
+                f.write(json.dumps({"position": position, "rows": rows}, ensure_ascii=False) + "\n")
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
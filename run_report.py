@@ -0,0 +1,175 @@
+"""실행 한 번의 단계별 소요 시간과 사용량을 모으는 보고서
+
+    report = RunReport(variant="word_pw")
+    with report.span("read_input"):
+        ...
+    report.update(prompt_tokens=..., retries=...)
+    report.to_json(), report.to_prometheus()
+
+단계(span)마다 걸린 시간을 모두 기록해 두고 횟수, 합계, p50/p95, 최대값으로 요약한다.
+실패한 단계는 "<단계>_failed"로 따로 센다. 여러 스레드에서 함께 기록해도 된다.
+"""
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# Prometheus 지표 이름 앞부분
+METRIC_PREFIX = "word"
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, round(fraction * (len(values) - 1)))]
+
+
+def _round(value):
+    return round(value, 4) if value is not None else None
+
+
+class RunReport:
+    """단계별 소요 시간(span)과 실행 값(토큰, 재요청 수 등)을 모으는 실행 보고서"""
+
+    def __init__(self, **labels):
+        # 보고서를 구분하는 값 (번역 방식, 파일 이름 등). Prometheus 라벨로도 사용
+        self.labels = labels
+        self.values = {}
+        self.created_at = time.time()
+        self._durations = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.add(f"{stage}_failed", time.perf_counter() - start)
+            raise
+        self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+
+    def timed(self, stage, function):
+        """function을 부를 때마다 stage로 시간을 재는 함수를 반환"""
+        def wrapper(*args, **kwargs):
+            with self.span(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def timed_iter(self, stage, iterable):
+        """iterable에서 값을 꺼내는 데 걸린 시간을 모두 더해 끝날 때 한 번 기록 (제너레이터 입력용)"""
+        total = 0.0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    total += time.perf_counter() - start
+                yield value
+        finally:
+            self.add(stage, total)
+
+    def update(self, **values):
+        with self._lock:
+            self.values.update(values)
+
+    def stages(self):
+        """단계별 {count, total_seconds, p50_seconds, p95_seconds, max_seconds}"""
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self._durations.items()}
+        return {
+            stage: {
+                "count": len(values),
+                "total_seconds": _round(sum(values)),
+                "p50_seconds": _round(percentile(values, 0.5)),
+                "p95_seconds": _round(percentile(values, 0.95)),
+                "max_seconds": _round(max(values)),
+            }
+            for stage, values in durations.items()
+        }
+
+    def to_dict(self):
+        with self._lock:
+            values = dict(self.values)
+        return {"labels": self.labels, "created_at": self.created_at, "values": values, "stages": self.stages()}
+
+    def dump(self):
+        """저장용 dict (단계별 기록을 모두 담음). load로 되살림"""
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self._durations.items()}
+            values = dict(self.values)
+        return {"labels": self.labels, "created_at": self.created_at, "values": values, "durations": durations}
+
+    @classmethod
+    def load(cls, data):
+        report = cls(**data["labels"])
+        report.created_at = data["created_at"]
+        report.values = dict(data["values"])
+        report._durations = {stage: list(values) for stage, values in data["durations"].items()}
+        return report
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        return prometheus_text([self])
+
+    def summary(self):
+        """로그용 한 줄 요약"""
+        stages = ", ".join(f"{stage} {info['total_seconds']}s/{info['count']}회" for stage, info in self.stages().items())
+        labels = " ".join(f"{name}={value}" for name, value in self.labels.items())
+        return f"[실행 보고서] {labels} {stages}".strip()
+
+    def log(self):
+        logger.info(self.summary())
+
+
+# ✅ 보고서가 없으면 아무것도 하지 않는 span (report=None을 받는 함수에서 사용)
+def span(report, stage):
+    return report.span(stage) if report is not None else nullcontext()
+
+
+def _labels(labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}" if labels else ""
+
+
+# ✅ 여러 보고서 → Prometheus 텍스트 형식 (지표마다 HELP/TYPE은 한 번만)
+def prometheus_text(reports):
+    stage_lines = []
+    value_lines = {}
+    for report in reports:
+        for stage, info in report.stages().items():
+            labels = {**report.labels, "stage": stage}
+            for quantile, key in (("0.5", "p50_seconds"), ("0.95", "p95_seconds")):
+                stage_lines.append(f"{METRIC_PREFIX}_stage_seconds{_labels({**labels, 'quantile': quantile})} {info[key]}")
+            stage_lines.append(f"{METRIC_PREFIX}_stage_seconds_sum{_labels(labels)} {info['total_seconds']}")
+            stage_lines.append(f"{METRIC_PREFIX}_stage_seconds_count{_labels(labels)} {info['count']}")
+        for name, value in report.to_dict()["values"].items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+                continue
+            value_lines.setdefault(name, []).append(f"{METRIC_PREFIX}_run_{name}{_labels(report.labels)} {value}")
+
+    lines = []
+    if stage_lines:
+        lines += [f"# HELP {METRIC_PREFIX}_stage_seconds Time spent per pipeline stage",
+                  f"# TYPE {METRIC_PREFIX}_stage_seconds summary", *stage_lines]
+    for name, metric_lines in value_lines.items():
+        lines += [f"# TYPE {METRIC_PREFIX}_run_{name} gauge", *metric_lines]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,98 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# ✅ 캐시 파일 위치 (환경 변수로 변경 가능)
+DEFAULT_CACHE_PATH = os.environ.get(
+    "WORD_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "translation_cache.sqlite3")
+)
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MAX_AGE_DAYS = 90
+
+
+# ✅ 캐시 키용 단어 정규화 (앞뒤 공백 제거, 연속 공백 정리, 대소문자 무시)
+def normalize_word(word):
+    return " ".join(str(word).split()).casefold()
+
+
+class TranslationCache:
+    """정규화된 단어 + 모델 + 프롬프트 버전별로 번역 결과 행을 저장하는 SQLite 캐시"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 60 * 60
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "namespace TEXT NOT NULL, word TEXT NOT NULL, row TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (namespace, word))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+
+    def get_many(self, words, namespace):
+        """캐시에 있는 단어의 결과 행을 {정규화된 단어: 행} 형태로 반환"""
+        keys = list({normalize_word(word) for word in words})
+        now = time.time()
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT word, row FROM translations WHERE namespace = ? AND created_at >= ? AND word IN ({placeholders})",
+                    [namespace, now - self.max_age, *chunk],
+                )
+                for word, row in cursor:
+                    found[word] = json.loads(row)
+            if found:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE translations SET last_used = ? WHERE namespace = ? AND word = ?",
+                        [(now, namespace, word) for word in found],
+                    )
+        return found
+
+    def put_many(self, rows_by_word, namespace):
+        """{단어: 행} 을 저장하고 오래되었거나 넘치는 항목을 정리"""
+        if not rows_by_word:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (namespace, word, row, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                [(namespace, normalize_word(word), json.dumps(row, ensure_ascii=False), now, now)
+                 for word, row in rows_by_word.items()],
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM translations WHERE created_at < ?", (now - self.max_age,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        if count > self.max_entries:
+            # 가장 오래 사용되지 않은 항목부터 삭제
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN "
+                "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+# ✅ 프로세스 전체에서 공유하는 캐시 인스턴스
+def get_default_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TranslationCache()
+        return _default_cache
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import threading
+import time
+
+from exchange_rate import get_exchange_rate
+
+# ✅ 사용량 기록 파일 위치
+DEFAULT_METRICS_PATH = os.environ.get(
+    "WORD_METRICS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "usage_metrics.sqlite3")
+)
+
+# ✅ 모델별 1K 토큰당 가격 (USD, 입력/출력)
+PRICES_PER_1K = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+DEFAULT_PRICE_PER_1K = (0.0015, 0.0015)
+
+# 실측 기록이 없을 때 쓰는 기본 추정값
+DEFAULT_TOKENS_PER_WORD = 2 + 50 * 1.2
+DEFAULT_SECONDS_PER_WORD = 0.2
+# 추정에 사용할 최근 요청 수
+PROFILE_WINDOW = 200
+
+
+class UsageStore:
+    """요청별 토큰 사용량(response.usage)과 지연 시간을 모델/프롬프트 버전별로 기록하는 SQLite 저장소"""
+
+    def __init__(self, path=DEFAULT_METRICS_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                "model TEXT NOT NULL, prompt_version TEXT NOT NULL, words INTEGER NOT NULL, "
+                "prompt_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, "
+                "latency REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS usage_variant ON usage (model, prompt_version, created_at)")
+
+    def record(self, model, prompt_version, words, prompt_tokens, completion_tokens, latency):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (model, prompt_version, words, prompt_tokens, completion_tokens, latency, time.time()),
+            )
+
+    def profile(self, model, prompt_version, window=PROFILE_WINDOW):
+        """최근 window개 요청의 단어당 평균 (입력 토큰, 출력 토큰, 초)와 요청 수를 반환. 기록이 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT SUM(words), SUM(prompt_tokens), SUM(completion_tokens), SUM(latency), COUNT(*) FROM "
+                "(SELECT * FROM usage WHERE model = ? AND prompt_version = ? ORDER BY created_at DESC LIMIT ?)",
+                (model, prompt_version, window),
+            ).fetchone()
+        words, prompt_tokens, completion_tokens, latency, requests = row
+        if not words:
+            return None
+        return {
+            "prompt_tokens_per_word": prompt_tokens / words,
+            "completion_tokens_per_word": completion_tokens / words,
+            "seconds_per_word": latency / words,
+            "requests": requests,
+        }
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+# ✅ 프로세스 전체에서 공유하는 사용량 저장소
+def get_default_store():
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = UsageStore()
+        return _default_store
+
+
+def usd_cost(model, prompt_tokens, completion_tokens):
+    input_price, output_price = PRICES_PER_1K.get(model, DEFAULT_PRICE_PER_1K)
+    return prompt_tokens / 1000 * input_price + completion_tokens / 1000 * output_price
+
+
+class RunUsage:
+    """한 번의 실행에서 사용한 토큰과 지연 시간을 합산하고 저장소에도 기록"""
+
+    def __init__(self, model, prompt_version, store=None):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.store = store if store is not None else get_default_store()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = []  # 요청별 응답 시간 (초)
+        self._lock = threading.Lock()
+
+    def record(self, words, response, latency):
+        """chat.completions 응답의 usage를 기록 (usage가 없는 응답은 건너뜀)"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.latencies.append(latency)
+        self.store.record(self.model, self.prompt_version, words, prompt_tokens, completion_tokens, latency)
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def usd_cost(self):
+        return usd_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+
+# ✅ 토큰 및 비용 계산 함수 (실측 기록이 있으면 모델/프롬프트 버전별 평균으로 추정)
+def estimate_cost(word_count, model, prompt_version, concurrency=1, store=None):
+    store = store if store is not None else get_default_store()
+    profile = store.profile(model, prompt_version)
+    if profile is None:
+        total_tokens = word_count * DEFAULT_TOKENS_PER_WORD
+        usd = (total_tokens / 1000) * DEFAULT_PRICE_PER_1K[1]
+        estimated_time = word_count * DEFAULT_SECONDS_PER_WORD
+        samples = 0
+    else:
+        prompt_tokens = word_count * profile["prompt_tokens_per_word"]
+        completion_tokens = word_count * profile["completion_tokens_per_word"]
+        total_tokens = round(prompt_tokens + completion_tokens)
+        usd = usd_cost(model, prompt_tokens, completion_tokens)
+        estimated_time = word_count * profile["seconds_per_word"] / max(1, concurrency)
+        samples = profile["requests"]
+    exchange_rate = get_exchange_rate()
+    krw_cost = usd * exchange_rate
+    return total_tokens, usd, krw_cost, exchange_rate, estimated_time, samples
@@ -0,0 +1,170 @@
+"""여러 단어 엑셀 파일을 브라우저 없이 한 번에 처리하는 명령행 도구
+
+    OPENAI_API_KEY=... python word_cli.py uploads/ "more/*.xlsx" --variant word_pw_ppt --concurrency 8
+
+입력은 엑셀, CSV, 텍스트 파일이며 단어를 한 줄씩 읽어 바로 배치 요청으로 넘긴다.
+파일마다 <이름>_translated.xlsx (파워포인트 방식이면 .pptx도)와 전체 summary.json을 만든다.
+summary.json에는 파일별 단계 소요 시간도 들어가며, --metrics-file을 주면 Prometheus 텍스트로도 남긴다.
+모든 파일이 동시 요청 수, 번역 캐시를 함께 나눠 쓴다. --batch-api를 주면 급하지 않은 대량 작업용으로
+OpenAI Batch API에 제출하고 완료될 때까지 기다린다 (가격 절반, 분당 요청 제한 없음).
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from batch_api import run_batch_job
+from batch_runner import DEFAULT_CONCURRENCY
+from rate_limiter import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE, RateLimiter
+from run_report import RunReport, prometheus_text
+from run_checkpoint import RunCheckpoint
+from translation_cache import get_default_cache
+from usage_metrics import RunUsage
+from word_core import VARIANTS, create_client, get_shared_client, translate_words, write_to_excel, write_to_pptx
+from word_reader import INPUT_TYPES, column_index, iter_words
+
+
+# ✅ 입력 경로 펼치기 (폴더 → 안의 엑셀/CSV/텍스트 파일, glob 패턴 → 일치하는 파일)
+def expand_inputs(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(path for extension in INPUT_TYPES for path in glob.glob(os.path.join(item, f"*.{extension}"))))
+        elif glob.has_magic(item):
+            paths.extend(sorted(glob.glob(item)))
+        else:
+            paths.append(item)
+    # 임시 잠금 파일(~$...)은 제외하고 중복 제거
+    return [path for path in dict.fromkeys(paths) if not os.path.basename(path).startswith("~$")]
+
+
+# ✅ 파일 하나 처리
+def process_file(path, client, variant, args, cache, limiter, report):
+    start_time = time.time()
+    words = report.timed_iter("read_input", iter_words(path, sheet=args.sheet, column=args.column))
+    stem, extension = os.path.splitext(os.path.basename(path))
+    if extension.lower() != ".xlsx":
+        # 같은 폴더의 단어.csv와 단어.txt 결과가 겹치지 않도록
+        stem = f"{stem}_{extension.lstrip('.').lower()}"
+
+    if args.batch_api:
+        # 배치 파일을 만들려면 단어 목록 전체가 필요
+        words = list(words)
+        with report.span("batch_job"):
+            translations, stats = run_batch_job(
+                client, words, variant, args.output_dir, stem, cache=cache, poll_seconds=args.poll_seconds,
+                on_status=lambda batch: print(f"[배치] {path}: {batch.status}", file=sys.stderr),
+            )
+        report.update(**stats)
+    else:
+        usage = RunUsage(variant.model, variant.prompt_version)
+        checkpoint = RunCheckpoint.for_source(path, variant.cache_namespace, (args.sheet, args.column))
+        translations, stats = translate_words(
+            words, client, variant, usage=usage, concurrency=args.concurrency, cache=cache,
+            checkpoint=checkpoint, limiter=limiter, session=path, report=report,
+        )
+        checkpoint.clear()
+        stats.update(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+                     usd_cost=usage.usd_cost)
+    result_df = pd.DataFrame(translations, columns=variant.columns)
+
+    outputs = [os.path.join(args.output_dir, f"{stem}_translated.xlsx")]
+    with open(outputs[0], "wb") as f:
+        f.write(report.timed("write_excel", write_to_excel)(result_df))
+    if variant.has_pptx and not args.no_pptx:
+        deck, extension = report.timed("write_pptx", write_to_pptx)(result_df)
+        outputs.append(os.path.join(args.output_dir, f"{stem}_translated.{extension}"))
+        with open(outputs[1], "wb") as f:
+            f.write(deck)
+
+    return {
+        "file": path,
+        "outputs": outputs,
+        "words": len(translations),
+        **stats,
+        "usd_cost": round(stats["usd_cost"], 6),
+        "seconds": round(time.time() - start_time, 2),
+        "stages": report.stages(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="단어 엑셀 파일 일괄 번역 (IPA 발음, 한국어 뜻, 예문)")
+    parser.add_argument("inputs", nargs="+", help="엑셀/CSV/텍스트 파일, 폴더 또는 glob 패턴")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default="word_pw_ppt", help="번역 방식 (기본: word_pw_ppt)")
+    parser.add_argument("--sheet", help="단어를 읽을 시트 이름 (기본: 첫 번째 시트)")
+    parser.add_argument("--column", type=column_index, default=0, help="단어 열 (A, B, ... 또는 1, 2, ... / 기본: A)")
+    parser.add_argument("--output-dir", default="translated", help="결과 저장 폴더 (기본: translated)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="전체 파일이 함께 쓰는 최대 동시 요청 수")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_REQUESTS_PER_MINUTE, help="분당 최대 요청 수 (응답 헤더의 실제 한도가 우선)")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TOKENS_PER_MINUTE, help="분당 최대 토큰 수 (응답 헤더의 실제 한도가 우선)")
+    parser.add_argument("--parallel-files", type=int, default=2, help="동시에 처리할 파일 수")
+    parser.add_argument("--no-cache", action="store_true", help="번역 캐시를 사용하지 않음")
+    parser.add_argument("--no-pptx", action="store_true", help="파워포인트를 만들지 않음")
+    parser.add_argument("--batch-api", action="store_true", help="OpenAI Batch API로 제출하고 완료될 때까지 기다림")
+    parser.add_argument("--metrics-file", help="파일별 단계 소요 시간과 사용량을 Prometheus 텍스트 형식으로 저장할 경로")
+    parser.add_argument("--poll-seconds", type=float, default=30, help="Batch API 상태 확인 간격 (초)")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"), help="OpenAI API 키 (기본: OPENAI_API_KEY)")
+    parser.add_argument("--base-url", default=os.environ.get("OPENAI_BASE_URL"), help="API 주소 (테스트용 가짜 서버 등)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 파일별 실행 보고서 한 줄 요약을 stderr로 출력
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # httpx 등의 요청 로그는 빼고 실행 보고서만 INFO로 출력
+    logging.getLogger("run_report").setLevel(logging.INFO)
+    if not args.api_key:
+        print("OpenAI API 키가 없습니다. OPENAI_API_KEY 환경 변수나 --api-key를 지정하세요.", file=sys.stderr)
+        return 2
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("처리할 단어 파일이 없습니다.", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    variant = VARIANTS[args.variant]
+    # 일반 요청은 429를 RateLimiter가 처리하므로 재요청하지 않는 공유 클라이언트 사용
+    client = create_client(args.api_key, args.base_url) if args.batch_api else get_shared_client(args.api_key, args.base_url)
+    cache = None if args.no_cache else get_default_cache()
+    # 모든 파일의 요청이 함께 나눠 쓰는 동시 요청 수, 분당 요청/토큰 한도 (파일별로 차례를 돌아가며 요청)
+    limiter = RateLimiter(args.rpm, args.tpm, max_in_flight=max(1, args.concurrency))
+
+    reports = []
+
+    def run(path):
+        report = RunReport(variant=variant.name, file=path)
+        reports.append(report)
+        try:
+            summary = process_file(path, client, variant, args, cache, limiter, report)
+        except Exception as e:
+            summary = {"file": path, "error": str(e), "stages": report.stages()}
+            print(f"[실패] {path}: {e}", file=sys.stderr)
+        else:
+            print(f"[완료] {path}: {summary['words']}개 단어, {summary['seconds']}초, ${summary['usd_cost']:.4f}", file=sys.stderr)
+        report.log()
+        return summary
+
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel_files)) as executor:
+        summaries = list(executor.map(run, paths))
+
+    report_path = os.path.join(args.output_dir, "summary.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"variant": variant.name, "files": summaries}, f, ensure_ascii=False, indent=2)
+    print(f"요약 보고서: {report_path}", file=sys.stderr)
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as f:
+            f.write(prometheus_text(reports))
+        print(f"지표 파일: {args.metrics_file}", file=sys.stderr)
+    return 1 if any("error" in summary for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""단어 번역 파이프라인의 공용 모듈 (Streamlit 앱과 CLI에서 함께 사용)
+
+streamlit은 가져오지 않고, openai, openpyxl, python-pptx는 처음 필요할 때 가져온다.
+"""
+import json
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from batch_planner import BatchPlanner, estimate_tokens
+from batch_runner import DEFAULT_CONCURRENCY, run_batches
+from response_parser import parse_translations
+from row_model import ROW_VERSION, is_valid_row, make_row_builder
+from run_report import span
+from word_reader import iter_words
+
+# ✅ 기본 모델
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+_TODDLER_SYSTEM_PROMPT = (
+    "You are a helpful assistant. Always respond in the following JSON format: "
+    '{"translations": [{"word": "<word>", "ipa": "<IPA pronunciation>", "korean": "<korean translations (comma-separated)>", "example": "<very short and simple English sentence for 3-4 year old toddlers>"}]}'
+)
+_TODDLER_USER_PROMPT = (
+    "Provide IPA pronunciation, a list of Korean translations, and a very short and simple English sentence for 3-4 year old toddlers. "
+    "The sentence should be very easy, simple, and clear. Avoid difficult words. Use very basic grammar. "
+    "Keep the sentence as short as possible. Here are the words: {words}."
+)
+_EXAMPLE_KOREAN_SYSTEM_PROMPT = (
+    "You are a helpful assistant. Always respond in the following JSON format: "
+    '{"translations": [{"word": "<word>", "ipa": "<IPA pronunciation>", "korean": "<korean translations>", "example": "<short English sentence>", "example_korean": "<Korean translation of the example>"}]}'
+)
+_EXAMPLE_KOREAN_USER_PROMPT = (
+    "Provide IPA pronunciation, a list of Korean translations, and a very short English sentence for toddlers "
+    "along with its Korean translation. Here are the words: {words}."
+)
+_EXAMPLE_KOREAN_COLUMNS = ["Word", "IPA", "Korean", "Combined Example", "English Example", "Korean Example"]
+# 엑셀 컬럼 너비
+EXCEL_COLUMN_WIDTHS = {"Word": 18, "IPA": 18, "Korean": 30, "Example Sentence": 50,
+                       "Combined Example": 60, "English Example": 40, "Korean Example": 40}
+
+
+class TranslationVariant:
+    """앱별 번역 방식: 프롬프트, 결과 컬럼, 실패 행 (응답 항목 → 결과 행 규칙은 row_model에서 공통)"""
+
+    def __init__(self, name, prompt_version, system_prompt, user_prompt, columns, error_values,
+                 completion_tokens_per_word, model=DEFAULT_MODEL, has_pptx=False, json_mode=True):
+        self.name = name
+        self.model = model
+        # 프롬프트를 바꾸면 버전을 올려서 캐시를 분리
+        self.prompt_version = prompt_version
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
+        self.columns = columns
+        # 응답 항목 목록 → 결과 행 목록 (배치 응답 전체를 한 번에 변환)
+        self.make_rows = make_row_builder(columns)
+        self.error_values = error_values
+        # 단어 하나당 예상 출력 토큰 수 (배치 크기 계산에 사용)
+        self.completion_tokens_per_word = completion_tokens_per_word
+        self.has_pptx = has_pptx
+        # JSON 모드면 모델이 항상 올바른 JSON 객체로 응답 (출력 한도에 걸려 잘린 경우만 예외)
+        self.json_mode = json_mode
+
+    @property
+    def cache_namespace(self):
+        return f"{self.model}:{self.prompt_version}:rows-v{ROW_VERSION}"
+
+    def messages(self, words):
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.user_prompt.format(words=json.dumps(words))},
+        ]
+
+    def request(self, words):
+        """chat.completions 요청 인자 (일반 요청과 Batch API가 함께 사용)"""
+        request = {"model": self.model, "messages": self.messages(words)}
+        if self.json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def error_row(self, word, reason):
+        """재요청까지 모두 실패한 단어의 행"""
+        return [word, "발음 없음", "번역 없음", *(value.format(reason=reason) for value in self.error_values)]
+
+
+# ✅ 앱별 번역 방식
+VARIANTS = {
+    "word_pw": TranslationVariant(
+        "word_pw", "word_pw-v1", _TODDLER_SYSTEM_PROMPT, _TODDLER_USER_PROMPT,
+        ["Word", "IPA", "Korean", "Example Sentence"], ["예문 오류 ({reason})"],
+        completion_tokens_per_word=45,
+    ),
+    "word_pw_new": TranslationVariant(
+        "word_pw_new", "word_pw_new-v1", _EXAMPLE_KOREAN_SYSTEM_PROMPT, _EXAMPLE_KOREAN_USER_PROMPT,
+        _EXAMPLE_KOREAN_COLUMNS, ["예문 오류", "", ""],
+        completion_tokens_per_word=90,
+    ),
+    "word_pw_ppt": TranslationVariant(
+        "word_pw_ppt", "word_pw_ppt-v1", _EXAMPLE_KOREAN_SYSTEM_PROMPT, _EXAMPLE_KOREAN_USER_PROMPT,
+        _EXAMPLE_KOREAN_COLUMNS, ["예문 오류", "예문 오류", "예문 오류"],
+        completion_tokens_per_word=90, has_pptx=True,
+    ),
+}
+
+
+# ✅ OpenAI 클라이언트 생성
+def create_client(api_key, base_url=None, max_retries=2):
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
+
+
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+
+# ✅ 프로세스 전체에서 공유하는 클라이언트 (연결 풀을 함께 사용)
+def get_shared_client(api_key, base_url=None):
+    """429 재요청은 RateLimiter와 run_batches가 맡으므로 SDK 자체 재요청은 끔"""
+    with _shared_clients_lock:
+        key = (api_key, base_url)
+        if key not in _shared_clients:
+            _shared_clients[key] = create_client(api_key, base_url, max_retries=0)
+        return _shared_clients[key]
+
+
+# ✅ 번역 및 예문 생성 함수 (요청이 실패하면 예외를 그대로 올려서 run_batches가 재요청)
+def generate_batch_translations(words, client, variant, usage=None, limiter=None, session=None, report=None):
+    """limiter(RateLimiter)를 주면 예상 토큰만큼 한도를 받은 뒤 요청하고, 응답 헤더와 실제 사용량을 돌려줌.
+    report(RunReport)를 주면 한도 대기, API 요청, 응답 변환 시간을 기록"""
+    request = variant.request(words)
+    if limiter is None:
+        request_start = time.time()
+        with span(report, "api_request"):
+            response = client.chat.completions.create(**request)
+    else:
+        tokens = sum(estimate_tokens(message["content"]) for message in request["messages"]) \
+            + len(words) * variant.completion_tokens_per_word
+        with span(report, "rate_limit_wait"):
+            tokens = limiter.acquire(tokens, session)
+        request_start = time.time()
+        try:
+            with span(report, "api_request"):
+                raw = client.chat.completions.with_raw_response.create(**request)
+                response = raw.parse()
+        except Exception as e:
+            limiter.release(tokens, error=e)
+            raise
+        used_tokens = response.usage.total_tokens if getattr(response, "usage", None) else None
+        limiter.release(tokens, used_tokens, raw.headers)
+    if usage is not None:
+        usage.record(len(words), response, time.time() - request_start)
+    with span(report, "parse_response"):
+        output = response.choices[0].message.content.strip()
+        return variant.make_rows(parse_translations(output))
+
+
+# ✅ 단어 목록 전체 번역 (배치 계획, 동시 요청, 캐시, 재요청, 체크포인트)
+def translate_words(words, client, variant, usage=None, concurrency=DEFAULT_CONCURRENCY, cache=None,
+                    checkpoint=None, on_progress=None, on_rows=None, limiter=None, session=None, report=None):
+    """결과 행 목록(입력 순서)과 실행 통계를 반환. words는 목록 대신 iter_words 제너레이터도 된다.
+    limiter(RateLimiter)를 주면 여러 실행이 분당 요청/토큰 한도를 함께 나눠 쓰고,
+    session별로 차례를 돌아가며 요청한다. report(RunReport)를 주면 요청별 시간과 실행 통계,
+    토큰 사용량을 기록한다."""
+    def translate(batch_words):
+        return generate_batch_translations(batch_words, client, variant, usage, limiter, session, report)
+
+    with span(report, "translate"):
+        translations, stats = run_batches(
+            words,
+            translate,
+            variant.error_row,
+            planner=BatchPlanner(completion_tokens_per_word=variant.completion_tokens_per_word),
+            concurrency=concurrency,
+            on_progress=on_progress,
+            on_rows=on_rows,
+            cache=cache,
+            cache_namespace=variant.cache_namespace,
+            checkpoint=checkpoint,
+            validate=is_valid_row,
+        )
+    if report is not None:
+        report.update(**stats)
+        if usage is not None:
+            report.update(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+                          usd_cost=usage.usd_cost)
+    return translations, stats
+
+
+# ✅ 업로드된 파일의 고른 시트/열(기본: 첫 번째 시트의 첫 번째 열, 머리글 제외)을 단어 표로 읽기
+def read_word_table(source, name=None, sheet=None, column=0):
+    return pd.DataFrame({"Word": list(iter_words(source, name=name, sheet=sheet, column=column))})
+
+
+# ✅ 엑셀 파일 저장 함수 (write-only 모드로 행을 바로 흘려 써서 큰 결과도 메모리를 적게 사용)
+def write_to_excel(result_df):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    # 컬럼 너비는 행을 쓰기 전에 지정해야 함
+    for index, column in enumerate(result_df.columns, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = EXCEL_COLUMN_WIDTHS.get(column, 20)
+
+    header_font = Font(bold=True)
+    header = []
+    for column in result_df.columns:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+    for row in result_df.itertuples(index=False, name=None):
+        sheet.append([None if pd.isna(value) else value for value in row])
+
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+# ✅ 다운로드 파일 캐시 (결과 버전이 바뀔 때만 새로 생성)
+def cached_export(store, version, kind, build, *args):
+    """store(예: st.session_state)에 버전별로 만든 파일을 보관하고, 버전이 바뀌면 이전 파일은 버림"""
+    exports = store.get("exports")
+    if exports is None or exports.get("version") != version:
+        exports = {"version": version}
+        store["exports"] = exports
+    if kind not in exports:
+        exports[kind] = build(*args)
+    return exports[kind]
+
+
+# ✅ 파워포인트 생성 함수 (python-pptx는 필요할 때만 가져옴)
+def write_to_pptx(result_df):
+    """(바이트, 확장자)를 반환. 단어가 많으면 여러 파일로 나눠 동시에 만들고 zip으로 묶는다."""
+    from pptx_builder import build_pptx_export
+
+    return build_pptx_export(result_df)
+
+
+def pptx_file_extension(row_count):
+    """write_to_pptx가 만들 파일의 확장자 ("pptx" 또는 "zip")"""
+    from pptx_builder import export_extension
+
+    return export_extension(row_count)
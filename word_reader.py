@@ -0,0 +1,140 @@
+"""업로드된 단어 파일을 한 번에 다 읽지 않고 한 줄씩 읽는 모듈
+
+엑셀(.xlsx)은 openpyxl 읽기 전용 모드로 고른 시트를 한 행씩, CSV는 csv 모듈로,
+텍스트(.txt)는 한 줄에 단어 하나로 읽는다. iter_words는 제너레이터라서 run_batches에
+그대로 넘기면 파일을 끝까지 읽기 전에 첫 요청을 보낼 수 있다.
+"""
+import codecs
+import csv
+import io
+import os
+from itertools import islice
+
+# ✅ 지원하는 입력 파일 형식
+INPUT_TYPES = ["xlsx", "csv", "txt"]
+# CSV/텍스트를 기본 인코딩(utf-8)으로 풀 수 없을 때 차례로 시도할 인코딩과 확인할 앞부분 크기
+FALLBACK_ENCODINGS = ["cp949"]
+SNIFF_BYTES = 64 * 1024
+
+
+def _file_type(source, name=None):
+    """확장자로 형식 판단 (이름을 알 수 없으면 기존처럼 엑셀로 읽음)"""
+    name = name or getattr(source, "name", None) or (source if isinstance(source, (str, os.PathLike)) else "")
+    extension = os.path.splitext(str(name))[1].lower().lstrip(".")
+    return extension if extension in INPUT_TYPES else "xlsx"
+
+
+def _rewind(source):
+    # 같은 업로드 파일을 여러 번 읽으므로 매번 처음부터
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _column_letter(index):
+    from openpyxl.utils import get_column_letter
+
+    return get_column_letter(index + 1)
+
+
+# ✅ 열 이름("A", "b") 또는 1부터 시작하는 번호("2") → 0부터 시작하는 열 번호
+def column_index(label):
+    label = str(label).strip()
+    if label.isdigit():
+        return max(0, int(label) - 1)
+    from openpyxl.utils import column_index_from_string
+
+    return column_index_from_string(label.upper()) - 1
+
+
+def _detect_encoding(source, encoding):
+    """앞부분을 encoding으로 풀 수 없으면 대신 쓸 인코딩 (한국어 엑셀의 "CSV (쉼표로 분리)"는 cp949)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            sample = f.read(SNIFF_BYTES)
+    else:
+        sample = _rewind(source).read(SNIFF_BYTES)
+    for candidate in (encoding, *FALLBACK_ENCODINGS):
+        try:
+            # 잘린 마지막 글자는 오류로 보지 않도록 이어 읽는 디코더로 확인
+            codecs.getincrementaldecoder(candidate)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return candidate
+    return encoding
+
+
+def _iter_rows(source, file_type, sheet=None, encoding="utf-8-sig"):
+    """파일의 행을 튜플(또는 리스트)로 하나씩 돌려줌"""
+    if file_type == "xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(_rewind(source), read_only=True, data_only=True, keep_links=False)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            yield from worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+        return
+
+    is_path = isinstance(source, (str, os.PathLike))
+    encoding = _detect_encoding(source, encoding)
+    stream = open(source, encoding=encoding, newline="") if is_path \
+        else io.TextIOWrapper(_rewind(source), encoding=encoding, newline="")
+    try:
+        if file_type == "csv":
+            yield from csv.reader(stream)
+        else:
+            for line in stream:
+                yield (line,)
+    finally:
+        # 업로드된 파일 객체는 닫지 않고 감싼 것만 풂
+        if is_path:
+            stream.close()
+        else:
+            stream.detach()
+
+
+# ✅ 엑셀 시트 이름 목록 (CSV/텍스트는 빈 목록)
+def list_sheets(source, name=None):
+    if _file_type(source, name) != "xlsx":
+        return []
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(_rewind(source), read_only=True, keep_links=False)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+# ✅ 첫 줄 기준 열 이름 목록 ("A: Word" 형태, 텍스트 파일은 열 하나)
+def list_columns(source, name=None, sheet=None, encoding="utf-8-sig"):
+    file_type = _file_type(source, name)
+    if file_type == "txt":
+        return ["A"]
+    rows = _iter_rows(source, file_type, sheet, encoding)
+    try:
+        header = next(rows, ())
+    finally:
+        rows.close()
+    return [f"{_column_letter(index)}: {value}" if value not in (None, "") else _column_letter(index)
+            for index, value in enumerate(header)] or ["A"]
+
+
+# ✅ 고른 시트/열의 단어를 위에서부터 하나씩 돌려주는 제너레이터
+def iter_words(source, name=None, sheet=None, column=0, skip_header=True, encoding="utf-8-sig"):
+    """빈 칸과 글자가 아닌 칸(숫자, 날짜 등)은 건너뛰고, 앞뒤 공백을 떼고 연속 공백을 하나로 줄인
+    단어를 돌려줌. 대소문자와 중복은 그대로 두고 run_batches에서 한 번만 요청한다.
+    skip_header: 첫 줄을 머리글로 보고 건너뜀 (텍스트 파일은 머리글이 없으므로 적용하지 않음)"""
+    file_type = _file_type(source, name)
+    rows = _iter_rows(source, file_type, sheet, encoding)
+    if skip_header and file_type != "txt":
+        rows = islice(rows, 1, None)
+    for row in rows:
+        value = row[column] if column < len(row) else None
+        if not isinstance(value, str):
+            continue
+        word = " ".join(value.split())
+        if word:
+            yield word